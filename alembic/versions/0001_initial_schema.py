@@ -0,0 +1,107 @@
+"""initial schema
+
+Schema as created by Base.metadata.create_all before migrations were
+introduced. A database that already has these tables is put under
+migrations with `alembic stamp 0001`, then `alembic upgrade head`
+(scripts/migrate.py does both).
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 10:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _base_columns():
+    return [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'customers',
+        *_base_columns(),
+        sa.Column('phone', sa.String(length=20), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=True),
+        sa.Column('first_name', sa.String(length=100), nullable=True),
+        sa.Column('last_name', sa.String(length=100), nullable=True),
+        sa.Column('bitrix_id', sa.String(length=50), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_customers_id', 'customers', ['id'])
+    op.create_index('ix_customers_phone', 'customers', ['phone'], unique=True)
+
+    op.create_table(
+        'products',
+        *_base_columns(),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('sku', sa.String(length=100), nullable=True),
+        sa.Column('description', sa.String(length=500), nullable=True),
+        sa.Column('photo', sa.String(length=500), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_products_id', 'products', ['id'])
+    op.create_index('ix_products_sku', 'products', ['sku'], unique=True)
+
+    op.create_table(
+        'logs',
+        *_base_columns(),
+        sa.Column('level', sa.String(length=20), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('module', sa.String(length=100), nullable=True),
+        sa.Column('data', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_logs_id', 'logs', ['id'])
+
+    op.create_table(
+        'payments',
+        *_base_columns(),
+        sa.Column('external_id', sa.String(length=255), nullable=True),
+        sa.Column('store_order_id', sa.String(length=255), nullable=True),
+        sa.Column('customer_id', sa.Integer(), nullable=True),
+        sa.Column('total_sum', sa.Float(), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=True),
+        sa.Column('invoice_data', sa.Text(), nullable=True),
+        sa.Column('products_data', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['customer_id'], ['customers.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_payments_id', 'payments', ['id'])
+    op.create_index('ix_payments_external_id', 'payments', ['external_id'], unique=True)
+    op.create_index('ix_payments_store_order_id', 'payments', ['store_order_id'])
+
+    op.create_table(
+        'payment_items',
+        *_base_columns(),
+        sa.Column('payment_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('customer_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('unit_price', sa.Float(), nullable=False),
+        sa.Column('total_price', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['customer_id'], ['customers.id']),
+        sa.ForeignKeyConstraint(['payment_id'], ['payments.id']),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_payment_items_id', 'payment_items', ['id'])
+
+
+def downgrade() -> None:
+    op.drop_table('payment_items')
+    op.drop_table('payments')
+    op.drop_table('logs')
+    op.drop_table('products')
+    op.drop_table('customers')
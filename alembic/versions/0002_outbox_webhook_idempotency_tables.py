@@ -0,0 +1,107 @@
+"""outbox, webhook, idempotency tables
+
+Objects added on top of the initial schema: the CRM outbox and webhook
+event queues, idempotency records, the catalog version sequence and the
+(status, created_at, id) payments index used by the reconciler. A database
+stamped 0001 gets them from here.
+
+The payments index is built with CREATE INDEX CONCURRENTLY on Postgres so
+writes to the table aren't blocked while it builds.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 10:15:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def _base_columns():
+    return [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'crm_outbox',
+        *_base_columns(),
+        sa.Column('customer_id', sa.Integer(), nullable=False),
+        sa.Column('operation', sa.String(length=50), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_crm_outbox_id', 'crm_outbox', ['id'])
+    op.create_index('ix_crm_outbox_status_next_attempt_at', 'crm_outbox', ['status', 'next_attempt_at'])
+    op.create_index(
+        'uq_crm_outbox_active_customer',
+        'crm_outbox',
+        ['customer_id'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('pending', 'processing')")
+    )
+
+    op.create_table(
+        'webhook_events',
+        *_base_columns(),
+        sa.Column('provider', sa.String(length=50), nullable=False),
+        sa.Column('event_key', sa.String(length=64), nullable=False),
+        sa.Column('body', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('event_key')
+    )
+    op.create_index('ix_webhook_events_id', 'webhook_events', ['id'])
+    op.create_index('ix_webhook_events_status_next_attempt_at', 'webhook_events', ['status', 'next_attempt_at'])
+
+    op.create_table(
+        'idempotency_records',
+        *_base_columns(),
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('request_hash', sa.String(length=64), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('response', sa.Text(), nullable=True),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('key')
+    )
+    op.create_index('ix_idempotency_records_id', 'idempotency_records', ['id'])
+
+    op.execute(sa.schema.CreateSequence(sa.Sequence('catalog_version_seq')))
+
+    # CONCURRENTLY can't run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_payments_status_created_at_id',
+            'payments',
+            ['status', 'created_at', 'id'],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_payments_status_created_at_id', table_name='payments', postgresql_concurrently=True)
+
+    op.execute(sa.schema.DropSequence(sa.Sequence('catalog_version_seq')))
+    op.drop_table('idempotency_records')
+    op.drop_table('webhook_events')
+    op.drop_table('crm_outbox')
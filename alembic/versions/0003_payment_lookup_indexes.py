@@ -0,0 +1,40 @@
+"""payment lookup indexes
+
+Indexes for PaymentItemRepository.get_by_payment_id/get_by_customer_id/
+get_by_product_id and PaymentRepository.get_by_customer_id. Payment status
+filters are already served by ix_payments_status_created_at_id.
+
+Built with CREATE INDEX CONCURRENTLY on Postgres so writes to the tables
+aren't blocked while the indexes build.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 10:30:00
+"""
+from alembic import op
+
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_payment_items_payment_id', 'payment_items', ['payment_id']),
+    ('ix_payment_items_customer_id', 'payment_items', ['customer_id']),
+    ('ix_payment_items_product_id', 'payment_items', ['product_id']),
+    ('ix_payments_customer_id', 'payments', ['customer_id']),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
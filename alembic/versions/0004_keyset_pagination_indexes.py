@@ -0,0 +1,36 @@
+"""keyset pagination indexes
+
+(created_at, id) indexes for the paginated customers, products and
+payments lists, so each page is an index range scan instead of a sort of
+the whole table.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 12:00:00
+"""
+from alembic import op
+
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_customers_created_at_id', 'customers', ['created_at', 'id']),
+    ('ix_products_created_at_id', 'products', ['created_at', 'id']),
+    ('ix_payments_created_at_id', 'payments', ['created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,31 @@
+"""payment items export index
+
+(created_at, id) index on payment_items for the date-range export, which
+reads a created_at range in (created_at, id) order. Payments already have
+ix_payments_created_at_id from 0004.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16 14:00:00
+"""
+from alembic import op
+
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_payment_items_created_at_id', 'payment_items', ['created_at', 'id'],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_payment_items_created_at_id', table_name='payment_items', postgresql_concurrently=True)
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.customer import CustomerCreate, CustomerUpdate, CustomerResponse
+from app.schemas.pagination import Page
 from app.dependencies import get_customer_service, get_crm_service
 from app.database import get_db
-from typing import List, Optional
+from app.config import settings
+from typing import Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -31,6 +33,22 @@ async def create_customer(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/", response_model=Page[CustomerResponse])
+async def get_customers(
+    limit: int = Query(settings.pagination_default_limit, ge=1, le=settings.pagination_max_limit),
+    after: Optional[str] = Query(None, description="next_cursor попередньої сторінки"),
+    customer_service = Depends(get_customer_service)
+):
+    """Отримання клієнтів посторінково (за датою створення)"""
+    try:
+        return await customer_service.list_customers(limit, after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to get customers: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.get("/{customer_id}", response_model=CustomerResponse)
 async def get_customer(
     customer_id: int,
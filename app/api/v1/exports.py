@@ -0,0 +1,83 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from app.core.types.export_types import ExportFormat
+from app.dependencies import get_export_service
+from app.services.export_service import ExportService
+from datetime import datetime
+from typing import AsyncIterator, Callable, Optional
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _export_response(
+    request: Request,
+    name: str,
+    export: Callable[[ExportFormat, Optional[datetime], Optional[datetime]], AsyncIterator[str]],
+    export_format: ExportFormat,
+    created_from: Optional[datetime],
+    created_to: Optional[datetime]
+) -> StreamingResponse:
+    """Потокова відповідь з файлом експорту"""
+    try:
+        chunks = export(export_format, created_from, created_to)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    async def body():
+        try:
+            async for chunk in chunks:
+                yield chunk
+                # Клієнт відключився - зупиняємо запит до БД, а не дочитуємо його
+                if await request.is_disconnected():
+                    break
+        finally:
+            await chunks.aclose()
+
+    period = "_".join(
+        value.date().isoformat() if value else "all" for value in (created_from, created_to)
+    )
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}_{period}.{export_format.value}"'}
+    )
+
+
+@router.get("/payments")
+async def export_payments(
+    request: Request,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    created_from: Optional[datetime] = Query(None, description="Створені від (включно)"),
+    created_to: Optional[datetime] = Query(None, description="Створені до (не включно)"),
+    export_service: ExportService = Depends(get_export_service)
+):
+    """Експорт платежів (NDJSON або CSV) за період створення
+
+    Рядки читаються з курсора БД пачками й одразу віддаються клієнту,
+    тож пам'ять не залежить від обсягу експорту.
+    """
+    return _export_response(
+        request, "payments", export_service.export_payments, export_format, created_from, created_to
+    )
+
+
+@router.get("/payment-items")
+async def export_payment_items(
+    request: Request,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    created_from: Optional[datetime] = Query(None, description="Створені від (включно)"),
+    created_to: Optional[datetime] = Query(None, description="Створені до (не включно)"),
+    export_service: ExportService = Depends(get_export_service)
+):
+    """Експорт позицій платежів (NDJSON або CSV) за період створення"""
+    return _export_response(
+        request, "payment_items", export_service.export_payment_items, export_format, created_from, created_to
+    )
@@ -1,14 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from app.schemas.payment import (
     PaymentRequest, PaymentResponse, PaymentStatus, 
-    PaymentCalculationResponse, ProductItemRequest
+    PaymentCalculationResponse, ProductItemRequest,
+    BatchCalculationRequest, BatchCalculationResponse, PaymentSummary
 )
-from app.dependencies import get_payment_service, get_product_service
+from app.schemas.pagination import Page
+from app.dependencies import (
+    get_payment_service, get_product_service, get_customer_service, get_unit_of_work,
+    get_payment_status_stream, get_idempotency_service, get_payment_list_service
+)
+from app.core.types.payment_types import PaymentState
+from app.repositories.unit_of_work import UnitOfWork
 from app.services.payment_service import PaymentService
 from app.services.product_service import ProductService
-from app.database import get_db
-from typing import Dict, Any, List
+from app.services.customer_service import CustomerService
+from app.services.payment_status_stream import PaymentStatusStream
+from app.services.payment_list_service import PaymentListService
+from app.services.idempotency_service import (
+    IdempotencyService, IdempotencyConflict, IdempotencyInProgress, request_hash
+)
+from app.config import settings
+from typing import Dict, Any, List, Optional
 
 router = APIRouter(prefix="/payments", tags=["payments"])
 
@@ -18,9 +31,14 @@ async def calculate_payment(
     products: List[ProductItemRequest],
     product_service: ProductService = Depends(get_product_service)
 ):
-    """Розрахунок суми платежу на бекенді"""
+    """Розрахунок суми платежу на бекенді
+    
+    Повертає також quote_token - підписані ціни, які /payments/create
+    використовує без повторного розрахунку, поки токен дійсний і каталог
+    не змінився.
+    """
     try:
-        result = await product_service.calculate_payment(products)
+        result = await product_service.quote_payment(products)
         return result
     except ValueError as e:
         raise HTTPException(
@@ -34,6 +52,25 @@ async def calculate_payment(
         )
 
 
+@router.post("/calculate/batch", response_model=BatchCalculationResponse)
+async def calculate_payment_batch(
+    request: BatchCalculationRequest,
+    product_service: ProductService = Depends(get_product_service)
+):
+    """Пакетний розрахунок сум для багатьох кошиків
+    
+    Товари всіх кошиків читаються одним запитом до каталогу; невідомі
+    товари дають помилку лише у своєму кошику.
+    """
+    try:
+        return await product_service.calculate_payment_batch(request)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Calculation failed: {str(e)}"
+        )
+
+
 @router.post("/validate", response_model=Dict[str, Any])
 async def validate_client(
     phone: str,
@@ -53,23 +90,33 @@ async def validate_client(
 @router.post("/create", response_model=PaymentResponse)
 async def create_payment(
     request: PaymentRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     payment_service: PaymentService = Depends(get_payment_service),
     product_service: ProductService = Depends(get_product_service),
-    db: AsyncSession = Depends(get_db)
+    customer_service: CustomerService = Depends(get_customer_service),
+    uow: UnitOfWork = Depends(get_unit_of_work),
+    idempotency_service: IdempotencyService = Depends(get_idempotency_service)
 ):
-    """Створення платежу"""
-    try:
-        from app.repositories.payment_repository import PaymentRepository
-        from app.repositories.payment_item_repository import PaymentItemRepository
-        from app.repositories.customer_repository import CustomerRepository
-        from app.services.customer_service import CustomerService
+    """Створення платежу
+    
+    Ідемпотентне за заголовком Idempotency-Key (або store_order_id):
+    повтор того самого запиту повертає збережену відповідь без нового
+    платежу та звернення до Monobank, а паралельні дублікати чекають
+    на результат першого запиту.
+    """
+    key = f"payments.create:{idempotency_key or request.store_order_id}"
+    
+    async def create() -> str:
+        # 1. Взяти ціни з підписаного quote_token, якщо він ще дійсний,
+        # інакше розрахувати суми через ProductService
+        calculation = None
+        if request.quote_token:
+            calculation = await product_service.price_from_quote(request.quote_token, request.products)
+        if calculation is None:
+            calculation = await product_service.calculate_payment(request.products)
         
-        # 1. Розрахувати суми через ProductService
-        calculation = await product_service.calculate_payment(request.products)
-        
-        # 2. Знайти/створити Customer
-        customer_repository = CustomerRepository(db)
-        customer_service = CustomerService(customer_repository)
+        # 2. Знайти/створити Customer: фіксується окремо, щоб паралельні
+        # замовлення з тим самим номером ділили один upsert
         customer = await customer_service.get_or_create_customer(
             phone=request.client_phone,
             first_name=None,
@@ -77,77 +124,92 @@ async def create_payment(
             email=None
         )
         
-        # 3. Створити Payment в БД
-        payment_repository = PaymentRepository(db)
-        payment_data = {
-            "external_id": None,  # Буде встановлено після Monobank
-            "store_order_id": request.store_order_id,
-            "customer_id": customer.id,
-            "total_sum": calculation.total_sum,
-            "status": "pending",
-            "invoice_data": request.invoice.json(),
-            "products_data": str([p.dict() for p in calculation.products])
-        }
-        
-        payment = await payment_repository.create(payment_data)
-        
-        # 4. Створити PaymentItem записи в БД
-        payment_item_repository = PaymentItemRepository(db)
-        created_items = []
-        
-        for product_data in calculation.products:
-            item_data = {
-                "payment_id": payment.id,
-                "product_id": product_data.product_id,
+        # Усі записи нижче йдуть в одній транзакції: помилка на будь-якому
+        # кроці (включно з Monobank) відкочує платіж і позиції
+        async with uow:
+            # 3. Підготувати Payment та PaymentItem записи
+            payment = uow.payments.add({
+                "external_id": None,  # Буде встановлено після Monobank
+                "store_order_id": request.store_order_id,
                 "customer_id": customer.id,
-                "quantity": product_data.quantity,
-                "unit_price": product_data.unit_price,
-                "total_price": product_data.total_price
-            }
-            
-            payment_item = await payment_item_repository.create(item_data)
-            created_items.append(payment_item)
-        
-        # 5. Підготувати дані для Monobank
-        order_data = {
-            "store_order_id": request.store_order_id,
-            "client_phone": request.client_phone,
-            "total_sum": calculation.total_sum,
-            "invoice": request.invoice.dict(),
-            "available_programs": [p.dict() for p in request.available_programs],
-            "products": [
+                "total_sum": calculation.total_sum,
+                "status": PaymentState.PENDING.value,
+                "invoice_data": request.invoice.json(),
+                "products_data": str([p.dict() for p in calculation.products])
+            })
+            created_items = uow.payment_items.add_many(payment, [
                 {
-                    "name": p.name,
-                    "count": p.quantity,
-                    "sum": p.total_price
+                    "product_id": product_data.product_id,
+                    "customer_id": customer.id,
+                    "quantity": product_data.quantity,
+                    "unit_price": product_data.unit_price,
+                    "total_price": product_data.total_price
                 }
-                for p in calculation.products
-            ],
-            "result_callback": request.result_callback
-        }
-        
-        # 6. Відправити в Monobank через PaymentService
-        monobank_result = await payment_service.create_payment(order_data)
-        
-        # 7. Оновити Payment з external_id
-        payment.external_id = monobank_result.get("order_id")
-        await payment_repository.update(payment)
+                for product_data in calculation.products
+            ])
+            
+            # 4. Один flush: ID повертаються через INSERT ... RETURNING
+            await uow.flush()
+            
+            # 5. Підготувати дані для Monobank
+            order_data = {
+                "store_order_id": request.store_order_id,
+                "client_phone": request.client_phone,
+                "total_sum": calculation.total_sum,
+                "invoice": request.invoice.dict(),
+                "available_programs": [p.dict() for p in request.available_programs],
+                "products": [
+                    {
+                        "name": p.name,
+                        "count": p.quantity,
+                        "sum": p.total_price
+                    }
+                    for p in calculation.products
+                ],
+                "result_callback": request.result_callback
+            }
+            
+            # 6. Відправити в Monobank через PaymentService
+            monobank_result = await payment_service.create_payment(order_data)
+            
+            # 7. Встановити external_id
+            payment.external_id = monobank_result.get("order_id")
+            
+            # 8. Зберегти відповідь для Idempotency-Key в тій самій транзакції,
+            # що й платіж: або зафіксовано обидва, або жодне
+            from app.schemas.payment_item import PaymentItemResponse
+            
+            response = PaymentResponse(
+                payment_id=payment.id,
+                external_id=payment.external_id,
+                status=payment.status,
+                total_sum=payment.total_sum,
+                products=calculation.products,
+                items=[
+                    PaymentItemResponse.model_validate(item)
+                    for item in created_items
+                ]
+            ).model_dump_json()
+            await uow.idempotency.complete(key, response)
+            await uow.commit()
         
-        # 8. Повернути результат
-        from app.schemas.payment_item import PaymentItemResponse
+        # 9. Повернути результат
+        return response
+    
+    try:
+        response = await idempotency_service.run(key, request_hash(request.model_dump_json()), create)
+        return PaymentResponse.model_validate_json(response)
         
-        return PaymentResponse(
-            payment_id=payment.id,
-            external_id=payment.external_id,
-            status=payment.status,
-            total_sum=payment.total_sum,
-            products=calculation.products,
-            items=[
-                PaymentItemResponse.model_validate(item)
-                for item in created_items
-            ]
+    except IdempotencyConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    except IdempotencyInProgress as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
         )
-        
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -155,15 +217,77 @@ async def create_payment(
         )
 
 
+@router.get("/", response_model=Page[PaymentSummary])
+async def get_payments(
+    limit: int = Query(settings.pagination_default_limit, ge=1, le=settings.pagination_max_limit),
+    after: Optional[str] = Query(None, description="next_cursor попередньої сторінки"),
+    payment_list_service: PaymentListService = Depends(get_payment_list_service)
+):
+    """Отримання платежів посторінково (за датою створення)"""
+    try:
+        return await payment_list_service.list_payments(limit, after)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get payments: {str(e)}"
+        )
+
+
 @router.get("/{payment_id}/status", response_model=PaymentStatus)
 async def get_payment_status(
     payment_id: str,
-    payment_service: PaymentService = Depends(get_payment_service)
+    wait: float = Query(0, ge=0, description="Long-poll: чекати зміни статусу до N секунд"),
+    status_stream: PaymentStatusStream = Depends(get_payment_status_stream)
+):
+    """Отримання статусу платежу
+    
+    Відповідає з локального Payment та кешу; в Monobank звертається лише
+    для незавершених платежів, статус яких давно не оновлювався.
+    З ?wait=N відповідь повертається одразу після зміни статусу (або
+    через N секунд), тож вітрині не потрібно опитувати endpoint у циклі.
+    """
+    try:
+        return await status_stream.wait(
+            payment_id,
+            timeout=min(wait, settings.payment_status_max_wait_seconds)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to get payment status: {str(e)}"
+        )
+
+
+@router.get("/{payment_id}/status/stream")
+async def stream_payment_status(
+    payment_id: str,
+    request: Request,
+    status_stream: PaymentStatusStream = Depends(get_payment_status_stream)
 ):
-    """Отримання статусу платежу"""
+    """Потік статусу платежу (Server-Sent Events)
+    
+    Надсилає поточний статус, потім кожну зміну; з'єднання закривається
+    після фінального статусу. Коментар-heartbeat тримає з'єднання живим.
+    """
+    updates = status_stream.stream(
+        payment_id,
+        heartbeat=settings.payment_status_stream_heartbeat_seconds,
+        max_duration=settings.payment_status_stream_max_seconds
+    )
+    
+    # Перший статус беремо до старту відповіді, щоб повернути 404 звичайним кодом
     try:
-        result = await payment_service.get_payment_status(payment_id)
-        return PaymentStatus(**result)
+        first = await updates.__anext__()
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -174,6 +298,25 @@ async def get_payment_status(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to get payment status: {str(e)}"
         )
+    
+    async def events():
+        try:
+            yield f"event: status\ndata: {first.model_dump_json()}\n\n"
+            async for update in updates:
+                if update is None:
+                    if await request.is_disconnected():
+                        break
+                    yield ": ping\n\n"
+                else:
+                    yield f"event: status\ndata: {update.model_dump_json()}\n\n"
+        finally:
+            await updates.aclose()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.post("/{payment_id}/confirm")
@@ -1,20 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
+from app.schemas.pagination import Page
 from app.services.product_service import ProductService
-from app.repositories.product_repository import ProductRepository
-from app.database import get_db
-from typing import List, Optional
+from app.services.catalog_cache import catalog_cache
+from app.dependencies import get_product_service
+from app.config import settings
+from typing import Optional
 
 router = APIRouter(prefix="/products", tags=["products"])
 
 
-def get_product_service(db: AsyncSession = Depends(get_db)) -> ProductService:
-    """Dependency для отримання сервісу товарів"""
-    product_repository = ProductRepository(db)
-    return ProductService(product_repository)
-
-
 @router.post("/", response_model=ProductResponse)
 async def create_product(
     product_data: ProductCreate,
@@ -36,15 +31,20 @@ async def create_product(
         )
 
 
-@router.get("/", response_model=List[ProductResponse])
+@router.get("/", response_model=Page[ProductResponse])
 async def get_products(
-    active_only: bool = True,
+    limit: int = Query(settings.pagination_default_limit, ge=1, le=settings.pagination_max_limit),
+    after: Optional[str] = Query(None, description="next_cursor попередньої сторінки"),
     product_service: ProductService = Depends(get_product_service)
 ):
-    """Отримання всіх товарів"""
+    """Отримання товарів посторінково (за датою створення)"""
     try:
-        products = await product_service.get_all_products(active_only=active_only)
-        return products
+        return await product_service.list_products(limit, after)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -52,6 +52,28 @@ async def get_products(
         )
 
 
+@router.get("/cache/stats")
+async def get_catalog_cache_stats():
+    """Статистика кешу каталогу (hit/miss)"""
+    return catalog_cache.stats()
+
+
+@router.get("/sku/{sku}", response_model=ProductResponse)
+async def get_product_by_sku(
+    sku: str,
+    product_service: ProductService = Depends(get_product_service)
+):
+    """Отримання товару за артикулом"""
+    product = await product_service.get_product_by_sku(sku)
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
+        )
+    
+    return product
+
+
 @router.get("/{product_id}", response_model=ProductResponse)
 async def get_product(
     product_id: int,
@@ -0,0 +1,52 @@
+import httpx
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def create_http_client(
+    max_connections: int,
+    max_keepalive_connections: int,
+    keepalive_expiry: float,
+    connect_timeout: float,
+    read_timeout: float,
+    http2: bool = False
+) -> httpx.AsyncClient:
+    """Create pooled httpx client with keep-alive limits and timeouts"""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        ),
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        http2=http2
+    )
+
+
+class HTTPClientRegistry:
+    """App-scoped registry of long-lived HTTP clients, one per provider"""
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def register(self, name: str, client: httpx.AsyncClient) -> httpx.AsyncClient:
+        """Register client for provider"""
+        self._clients[name] = client
+        logger.info(f"Registered HTTP client: {name}")
+        return client
+
+    def get(self, name: str) -> Optional[httpx.AsyncClient]:
+        """Get client for provider, None outside of the app lifespan"""
+        return self._clients.get(name)
+
+    async def close_all(self) -> None:
+        """Close all registered clients"""
+        for name, client in self._clients.items():
+            await client.aclose()
+            logger.info(f"Closed HTTP client: {name}")
+        self._clients.clear()
+
+
+http_clients = HTTPClientRegistry()
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 
 class CRMProviderInterface(ABC):
@@ -24,3 +24,31 @@ class CRMProviderInterface(ABC):
     async def search_contact_by_phone(self, phone: str) -> Optional[Dict[str, Any]]:
         """Search contact by phone number"""
         pass
+
+
+class BatchCRMProviderInterface(CRMProviderInterface):
+    """CRM provider that can pack many contact operations into one request
+    
+    Every method returns one entry per input item, in input order:
+    {"result": ...} on success or {"error": ...} on failure.
+    """
+    
+    @abstractmethod
+    async def create_contacts(self, contacts_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create contacts in CRM"""
+        pass
+    
+    @abstractmethod
+    async def get_contacts(self, contact_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get contacts by IDs"""
+        pass
+    
+    @abstractmethod
+    async def update_contacts(self, updates: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Update contacts given (contact_id, contact_data) pairs"""
+        pass
+    
+    @abstractmethod
+    async def search_contacts_by_phone(self, phones: List[str]) -> List[Dict[str, Any]]:
+        """Search contacts by phone numbers; result is the first match or None"""
+        pass
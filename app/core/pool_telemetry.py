@@ -0,0 +1,148 @@
+import bisect
+import time
+from typing import Any, Dict, List, Optional
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, PoolProxiedConnection
+
+# Upper bounds of checkout wait buckets, milliseconds; the last bucket is open-ended
+WAIT_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+class PoolTelemetry:
+    """Counters and a checkout wait histogram for one connection pool
+
+    Fed by pool events (checkouts, checkins, opened and closed connections,
+    invalidations) and by TelemetryQueuePool.connect (checkout waits and
+    timeouts), so only public SQLAlchemy APIs are involved.
+    """
+
+    def __init__(self, buckets: List[float] = WAIT_BUCKETS_MS):
+        self.buckets = buckets
+        # A gauge, not a counter: reset() leaves it alone
+        self.open_connections = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero all counters"""
+        self.wait_counts = [0] * (len(self.buckets) + 1)
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.overflow_connects = 0
+        self.invalidations = 0
+        self.held_count = 0
+        self.held_total_ms = 0.0
+        self.held_max_ms = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        """Record how long a checkout took to get a connection"""
+        wait_ms = seconds * 1000
+        self.wait_counts[bisect.bisect_left(self.buckets, wait_ms)] += 1
+        self.wait_total_ms += wait_ms
+        self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+
+    def record_timeout(self) -> None:
+        """Record a checkout that gave up after pool_timeout"""
+        self.timeouts += 1
+
+    def record_held(self, seconds: float) -> None:
+        """Record how long a connection was checked out before its checkin"""
+        held_ms = seconds * 1000
+        self.held_count += 1
+        self.held_total_ms += held_ms
+        self.held_max_ms = max(self.held_max_ms, held_ms)
+
+    def attach(self, engine: Engine) -> None:
+        """Listen to pool events of engine (kept across pool re-creation)"""
+
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_connection, connection_record) -> None:
+            self.connects += 1
+            self.open_connections += 1
+            # Counted here rather than from pool.overflow(): the pool reserves
+            # overflow slots for checkouts still awaiting their connection
+            if isinstance(engine.pool, AsyncAdaptedQueuePool) and self.open_connections > engine.pool.size():
+                self.overflow_connects += 1
+
+        @event.listens_for(engine, "close")
+        def on_close(dbapi_connection, connection_record) -> None:
+            self.open_connections -= 1
+
+        @event.listens_for(engine, "detach")
+        def on_detach(dbapi_connection, connection_record) -> None:
+            self.open_connections -= 1
+
+        @event.listens_for(engine, "checkout")
+        def on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+            self.checkouts += 1
+            connection_record.info["checked_out_at"] = time.perf_counter()
+
+        @event.listens_for(engine, "checkin")
+        def on_checkin(dbapi_connection, connection_record) -> None:
+            checked_out_at = connection_record.info.pop("checked_out_at", None)
+            if checked_out_at is not None:
+                self.record_held(time.perf_counter() - checked_out_at)
+
+        @event.listens_for(engine, "invalidate")
+        def on_invalidate(dbapi_connection, connection_record, exception) -> None:
+            self.invalidations += 1
+
+    def snapshot(self, pool: Optional[Pool] = None) -> Dict[str, Any]:
+        """Current pool state plus counters since start (or last reset)"""
+        histogram = {
+            f"le_{bound}ms": count for bound, count in zip(self.buckets, self.wait_counts)
+        }
+        histogram[f"gt_{self.buckets[-1]}ms"] = self.wait_counts[-1]
+        waits = sum(self.wait_counts)
+
+        data: Dict[str, Any] = {
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.timeouts,
+            "connects": self.connects,
+            "open_connections": self.open_connections,
+            "overflow_connects": self.overflow_connects,
+            "invalidations": self.invalidations,
+            "wait_ms": {
+                "avg": round(self.wait_total_ms / waits, 3) if waits else 0.0,
+                "max": round(self.wait_max_ms, 3),
+                "histogram": histogram
+            },
+            "held_ms": {
+                "avg": round(self.held_total_ms / self.held_count, 3) if self.held_count else 0.0,
+                "max": round(self.held_max_ms, 3)
+            }
+        }
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            data.update({
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0)
+            })
+        return data
+
+
+pool_telemetry = PoolTelemetry()
+
+
+class TelemetryQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times Pool.connect() into pool_telemetry
+
+    No pool event fires when a checkout starts waiting, so the wait is taken
+    around the public connect() the engine calls for every checkout. It
+    includes opening a new connection and the pre-ping, i.e. everything a
+    request waits for before it can run a query.
+    """
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_telemetry.record_timeout()
+            raise
+        pool_telemetry.record_wait(time.perf_counter() - started)
+        return connection
@@ -0,0 +1,78 @@
+import asyncio
+from typing import Any, Dict, Hashable, Optional, Set
+
+
+class Subscription:
+    """Messages published to one key, buffered until read"""
+
+    def __init__(self, pubsub: "PubSub", key: Hashable, queue_size: int):
+        self.pubsub = pubsub
+        self.key = key
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.pubsub.unsubscribe(self)
+
+    def put(self, message: Any) -> None:
+        """Buffer message, dropping the oldest one when full (readers want the latest)"""
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """Next message, or None on timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class PubSub:
+    """In-process fan-out of messages to subscribers by key
+
+    A waiting subscriber is just a parked coroutine and a small queue, so
+    thousands of them cost little; publish() never blocks. Meant for a
+    single event loop and a single process.
+    """
+
+    def __init__(self, queue_size: int = 8):
+        self.queue_size = queue_size
+        self._subscribers: Dict[Hashable, Set[Subscription]] = {}
+        self.published = 0
+        self.delivered = 0
+
+    def subscribe(self, key: Hashable) -> Subscription:
+        """Subscribe to key; use as a context manager to unsubscribe"""
+        subscription = Subscription(self, key, self.queue_size)
+        self._subscribers.setdefault(key, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove subscription"""
+        subscribers = self._subscribers.get(subscription.key)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.key]
+
+    def publish(self, key: Hashable, message: Any) -> int:
+        """Deliver message to subscribers of key, return how many got it"""
+        self.published += 1
+        subscribers = self._subscribers.get(key, ())
+        for subscription in subscribers:
+            subscription.put(message)
+        self.delivered += len(subscribers)
+        return len(subscribers)
+
+    def stats(self) -> Dict[str, Any]:
+        """Subscriber and message counters"""
+        return {
+            "keys": len(self._subscribers),
+            "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values()),
+            "published": self.published,
+            "delivered": self.delivered
+        }
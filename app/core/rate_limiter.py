@@ -0,0 +1,73 @@
+import asyncio
+import time
+from typing import Optional
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a token could not be acquired within the allowed wait"""
+    pass
+
+
+class TokenBucket:
+    """Async token bucket rate limiter
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    Callers that find the bucket empty queue up and are served in FIFO
+    order, so a burst is spread out at the refill rate instead of failing.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._waiting = 0
+
+    @property
+    def waiting(self) -> int:
+        """Number of callers queued for a token"""
+        return self._waiting
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, timeout: Optional[float] = None) -> float:
+        """Wait for a token and return the time spent waiting in seconds"""
+        started = time.monotonic()
+        deadline = started + timeout if timeout is not None else None
+
+        self._waiting += 1
+        try:
+            try:
+                await asyncio.wait_for(self._lock.acquire(), timeout)
+            except asyncio.TimeoutError:
+                raise RateLimitTimeout(f"No rate limit token within {timeout}s")
+
+            try:
+                while True:
+                    self._refill()
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return time.monotonic() - started
+
+                    delay = (1 - self._tokens) / self.rate
+                    if deadline is not None and time.monotonic() + delay > deadline:
+                        raise RateLimitTimeout(f"No rate limit token within {timeout}s")
+                    await asyncio.sleep(delay)
+            finally:
+                self._lock.release()
+        finally:
+            self._waiting -= 1
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the server reported its limit exceeded"""
+        self._tokens = 0.0
+        self._updated_at = time.monotonic()
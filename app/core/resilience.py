@@ -0,0 +1,224 @@
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+import httpx
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the provider while its circuit is open"""
+    pass
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Errors that say the provider is unhealthy: network failures, timeouts, 429 and 5xx"""
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return False
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker for one provider
+
+    Closed: calls pass, consecutive transient failures are counted.
+    Open (after `failure_threshold` of them): calls fail immediately with
+    CircuitOpenError for `recovery_timeout` seconds.
+    Half-open: up to `half_open_max_calls` probe calls pass; a success
+    closes the circuit, a failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        is_failure: Callable[[BaseException], bool] = is_transient_error
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.is_failure = is_failure
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Current state; an open circuit turns half-open once recovery_timeout passed"""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    def _before_call(self) -> bool:
+        """Admit a call or raise CircuitOpenError; True if the call is a half-open probe"""
+        state = self.state
+        if state == self.OPEN or (state == self.HALF_OPEN and self._half_open_calls >= self.half_open_max_calls):
+            self.rejected += 1
+            raise CircuitOpenError(f"Circuit for {self.name} is open")
+        if state == self.HALF_OPEN:
+            self._half_open_calls += 1
+            return True
+        return False
+
+    def _on_success(self) -> None:
+        if self._state != self.CLOSED:
+            logger.info(f"Circuit for {self.name} closed")
+        self._state = self.CLOSED
+        self._failures = 0
+
+    def _on_failure(self) -> None:
+        self._failures += 1
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                logger.warning(f"Circuit for {self.name} opened after {self._failures} failures")
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn through the breaker"""
+        probe = self._before_call()
+        try:
+            result = await fn()
+        except Exception as e:
+            if self.is_failure(e):
+                self._on_failure()
+            elif self._state == self.HALF_OPEN:
+                # A non-transient error (e.g. 404) still proves the provider answers
+                self._on_success()
+            raise
+        except BaseException:
+            # Cancelled (client disconnect, timeout): says nothing about the
+            # provider, so give the probe slot back for the next call
+            if probe and self._state == self.HALF_OPEN:
+                self._half_open_calls -= 1
+            raise
+        self._on_success()
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """State and counters for monitoring"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "rejected": self.rejected
+        }
+
+
+class RetryBudget:
+    """Caps retries at a fraction of requests, shared by all providers
+
+    Every request deposits `ratio` tokens and every retry spends one, so
+    retries add at most `ratio` extra load; `min_per_second` tokens are
+    added over time so low-traffic periods can still retry.
+    """
+
+    def __init__(self, ratio: float = 0.1, min_per_second: float = 1.0, capacity: float = 100.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self.exhausted = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.min_per_second)
+        self._updated_at = now
+
+    def record_request(self) -> None:
+        """Deposit for a first attempt"""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take a token for a retry, False when the budget is exhausted"""
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        self.exhausted += 1
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Budget level for monitoring"""
+        self._refill()
+        return {"tokens": round(self._tokens, 2), "exhausted": self.exhausted}
+
+
+class ResiliencePolicy:
+    """Circuit breaker plus budgeted, jittered retries for one provider
+
+    Only idempotent calls are retried, and never once the circuit is open.
+    """
+
+    def __init__(
+        self,
+        breaker: CircuitBreaker,
+        budget: RetryBudget,
+        max_attempts: int = 3,
+        backoff_base: float = 0.2,
+        backoff_max: float = 2.0
+    ):
+        self.breaker = breaker
+        self.budget = budget
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    async def call(self, fn: Callable[[], Awaitable[T]], idempotent: bool = False) -> T:
+        """Run fn through the breaker, retrying transient failures of idempotent calls"""
+        self.budget.record_request()
+        if not idempotent or self.max_attempts <= 1:
+            return await self.breaker.call(fn)
+
+        # stop_any short-circuits: the budget is only spent when attempts remain
+        retrying = AsyncRetrying(
+            retry=retry_if_exception(is_transient_error),
+            stop=stop_after_attempt(self.max_attempts) | (lambda _: not self.budget.try_spend()),
+            wait=wait_random_exponential(multiplier=self.backoff_base, max=self.backoff_max),
+            reraise=True
+        )
+        return await retrying(self.breaker.call, fn)
+
+
+class ResilienceRegistry:
+    """App-scoped registry of resilience policies, one per provider"""
+
+    def __init__(self):
+        self._policies: Dict[str, ResiliencePolicy] = {}
+
+    def register(self, name: str, policy: ResiliencePolicy) -> ResiliencePolicy:
+        """Register policy for provider"""
+        self._policies[name] = policy
+        return policy
+
+    def get(self, name: str) -> Optional[ResiliencePolicy]:
+        """Get policy for provider, None outside of the app lifespan"""
+        return self._policies.get(name)
+
+    def stats(self) -> Dict[str, Any]:
+        """Breaker states by provider"""
+        return {name: policy.breaker.stats() for name, policy in self._policies.items()}
+
+
+resilience_policies = ResilienceRegistry()
@@ -2,4 +2,10 @@ from enum import Enum
 
 class CRMProviderType(str, Enum):
     """CRM provider types"""
-    BITRIX = "bitrix"
\ No newline at end of file
+    BITRIX = "bitrix"
+
+class ContactCheck(str, Enum):
+    """Outcome of checking a CRM contact ID against a phone"""
+    VALID = "valid"
+    MISMATCH = "mismatch"  # No such contact, or the phone isn't on it
+    ERROR = "error"  # The CRM request failed; check again later
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class ExportFormat(str, Enum):
+    """Export file formats"""
+    NDJSON = "ndjson"
+    CSV = "csv"
@@ -3,4 +3,11 @@ from enum import Enum
 class PaymentProviderType(str, Enum):
     """Payment provider types"""
     MONOBANK = "monobank"
-    PRIVATBANK = "privatbank"
\ No newline at end of file
+    PRIVATBANK = "privatbank"
+
+class PaymentState(str, Enum):
+    """Local payment statuses"""
+    PENDING = "pending"
+    IN_PROCESS = "in_process"
+    SUCCESS = "success"
+    FAIL = "fail"
@@ -1,14 +1,41 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from app.core.pool_telemetry import TelemetryQueuePool, pool_telemetry
+
+# Кеш prepared statements asyncpg (0 - вимкнено, потрібно за pgbouncer)
+connect_args = {}
+if make_url(settings.database_url).get_driver_name() == "asyncpg":
+    connect_args = {
+        "prepared_statement_cache_size": settings.database_statement_cache_size,
+        "statement_cache_size": settings.database_statement_cache_size
+    }
 
 # Створення асинхронного двигуна БД
 engine = create_async_engine(
     settings.database_url,
     echo=settings.database_echo,
-    future=True
+    future=True,
+    poolclass=TelemetryQueuePool,
+    pool_size=settings.database_pool_size,
+    max_overflow=settings.database_max_overflow,
+    pool_timeout=settings.database_pool_timeout,
+    pool_recycle=settings.database_pool_recycle,
+    pool_pre_ping=settings.database_pool_pre_ping,
+    connect_args=connect_args
 )
 
+# Телеметрія пулу: checkout/checkin, нові з'єднання, overflow, інвалідації
+pool_telemetry.attach(engine.sync_engine)
+
 # Створення фабрики сесій
 async_session = sessionmaker(
     engine, 
@@ -17,6 +44,40 @@ async_session = sessionmaker(
 )
 
 
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+
+@lru_cache(maxsize=1)
+def get_schema_head() -> Optional[str]:
+    """Остання ревізія міграцій, з якою працює код"""
+    return ScriptDirectory.from_config(Config(str(ALEMBIC_INI))).get_current_head()
+
+
+async def get_schema_version() -> Optional[str]:
+    """Поточна ревізія схеми БД (None - міграції не застосовувались)"""
+    async with engine.connect() as conn:
+        try:
+            # Один запит замість інспекції каталогу
+            return await conn.scalar(text("SELECT version_num FROM alembic_version"))
+        except DBAPIError:
+            await conn.rollback()
+            has_table = await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table("alembic_version"))
+            if has_table:
+                raise
+            return None
+
+
+async def check_schema_version() -> None:
+    """Перевірка, що БД мігрована до останньої ревізії (міграції: scripts/migrate.py)"""
+    head = get_schema_head()
+    current = await get_schema_version()
+    if current != head:
+        raise RuntimeError(
+            f"Database schema is at revision {current}, expected {head}. "
+            f"Run `python scripts/migrate.py` before starting the app"
+        )
+
+
 async def get_db():
     """Dependency для отримання сесії БД"""
     async with async_session() as session:
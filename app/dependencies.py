@@ -1,40 +1,106 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.types.crm_types import CRMProviderType
-from app.core.types.payment_types import PaymentProviderType
-from app.database import get_db
+from app.database import async_session, get_db
+from app.schemas.payment import PaymentStatus
 from app.services.payment_service import PaymentService
 from app.services.product_service import ProductService
 from app.services.customer_service import CustomerService
-from app.services.payment_provider_factory import PaymentProviderFactory
+from app.services.payment_state_machine import PaymentStateMachine
+from app.services.payment_list_service import PaymentListService
+from app.services.export_service import ExportService
+from app.services.payment_status_service import PaymentStatusService
+from app.services.payment_status_cache import payment_status_cache
+from app.services.payment_status_stream import PaymentStatusStream
+from app.services.payment_events import payment_events
+from app.services.idempotency_service import IdempotencyService, idempotency_cache
+from app.repositories.idempotency_repository import IdempotencyRepository
+from app.services.payment_provider_factory import PaymentProviderFactory, create_payment_service
 from app.services.crm_provider_factory import CRMProviderFactory
 from app.services.crm_service import CRMService
+from app.services.catalog_cache import catalog_cache
+from app.services.customer_cache import customer_cache
 from app.repositories.product_repository import ProductRepository
 from app.repositories.customer_repository import CustomerRepository
+from app.repositories.payment_repository import PaymentRepository
+from app.repositories.unit_of_work import UnitOfWork
 from app.config import settings
 
 
 def get_product_service(db: AsyncSession = Depends(get_db)) -> ProductService:
     """Dependency for ProductService"""
     product_repository = ProductRepository(db)
-    return ProductService(product_repository)
+    return ProductService(
+        product_repository,
+        catalog_cache,
+        notify_channel=settings.catalog_notify_channel if settings.catalog_notify_enabled else None,
+        quote_ttl=settings.payment_quote_ttl_seconds
+    )
 
 
 def get_payment_service(db: AsyncSession = Depends(get_db)) -> PaymentService:
     """Dependency for PaymentService with configurable provider"""
-    provider = PaymentProviderFactory.create_provider(
-        provider_type=PaymentProviderType.MONOBANK,
-        store_id=settings.monobank_store_id,
-        store_secret=settings.monobank_store_secret,
-        base_url=settings.monobank_base_url
+    return create_payment_service()
+
+
+def get_payment_state_machine(db: AsyncSession = Depends(get_db)) -> PaymentStateMachine:
+    """Dependency for PaymentStateMachine"""
+    return PaymentStateMachine(PaymentRepository(db))
+
+
+def get_payment_list_service(db: AsyncSession = Depends(get_db)) -> PaymentListService:
+    """Dependency for PaymentListService"""
+    return PaymentListService(PaymentRepository(db))
+
+
+def get_export_service() -> ExportService:
+    """Dependency for ExportService; each export opens its own session for the stream"""
+    return ExportService(async_session, batch_size=settings.export_batch_size)
+
+
+def get_payment_status_stream() -> PaymentStatusStream:
+    """Dependency for PaymentStatusStream
+    
+    Takes no request-scoped session: every status check opens its own short
+    one, so clients waiting for a change don't hold DB connections.
+    """
+    payment_service = create_payment_service()
+    
+    async def load_status(payment_ref: str) -> PaymentStatus:
+        async with async_session() as session:
+            status_service = PaymentStatusService(
+                PaymentRepository(session),
+                payment_service,
+                status_cache=payment_status_cache,
+                refresh_after=settings.payment_status_refresh_seconds
+            )
+            return await status_service.get_status(payment_ref)
+    
+    return PaymentStatusStream(
+        load_status,
+        payment_events,
+        recheck_interval=settings.payment_status_recheck_seconds
+    )
+
+
+def get_idempotency_service(db: AsyncSession = Depends(get_db)) -> IdempotencyService:
+    """Dependency for IdempotencyService"""
+    return IdempotencyService(
+        IdempotencyRepository(db),
+        cache=idempotency_cache,
+        lease_seconds=settings.idempotency_lease_seconds
     )
-    return PaymentService(provider)
 
 
 def get_customer_service(db: AsyncSession = Depends(get_db)) -> CustomerService:
     """Dependency for CustomerService"""
     customer_repository = CustomerRepository(db)
-    return CustomerService(customer_repository)
+    return CustomerService(customer_repository, customer_cache=customer_cache)
+
+
+def get_unit_of_work(db: AsyncSession = Depends(get_db)) -> UnitOfWork:
+    """Dependency for UnitOfWork over the request session"""
+    return UnitOfWork(db)
 
 
 def get_crm_service() -> CRMService:
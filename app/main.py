@@ -1,9 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.database import engine
-from app.models.base import Base
-from app.api.v1 import payments, customers, products
+from app.database import engine, check_schema_version
+from app.core.pool_telemetry import pool_telemetry
+from app.core.http_client import create_http_client, http_clients
+from app.core.resilience import CircuitBreaker, ResiliencePolicy, RetryBudget, resilience_policies
+from app.core.types.payment_types import PaymentProviderType
+from app.core.types.crm_types import CRMProviderType
+from app.services.catalog_listener import catalog_listener
+from app.services.crm_outbox_worker import crm_outbox_worker
+from app.services.webhook_worker import webhook_worker
+from app.services.payment_reconciler import payment_reconciler
+from app.api.v1 import payments, customers, products, exports
 from app.webhooks.monobank_webhook import router as webhook_router
 import logging
 
@@ -30,6 +38,7 @@ app.add_middleware(
 app.include_router(payments.router, prefix="/api/v1")
 app.include_router(customers.router, prefix="/api/v1")
 app.include_router(products.router, prefix="/api/v1")
+app.include_router(exports.router, prefix="/api/v1")
 app.include_router(webhook_router, prefix="/api/v1")
 
 
@@ -38,17 +47,74 @@ async def startup_event():
     """Події при запуску додатку"""
     logger.info("Starting SmartKasa Integration API...")
     
-    # Create database tables
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Schema is migrated before rollout (scripts/migrate.py), workers only verify it
+    if settings.database_schema_check:
+        await check_schema_version()
+        logger.info("Database schema is up to date")
     
-    logger.info("Database tables created successfully")
+    # Long-lived pooled HTTP clients for providers
+    http_clients.register(PaymentProviderType.MONOBANK, create_http_client(
+        max_connections=settings.monobank_http_max_connections,
+        max_keepalive_connections=settings.monobank_http_max_keepalive_connections,
+        keepalive_expiry=settings.monobank_http_keepalive_expiry,
+        connect_timeout=settings.monobank_http_connect_timeout,
+        read_timeout=settings.monobank_http_read_timeout,
+        http2=settings.monobank_http2
+    ))
+    http_clients.register(CRMProviderType.BITRIX, create_http_client(
+        max_connections=settings.bitrix_http_max_connections,
+        max_keepalive_connections=settings.bitrix_http_max_keepalive_connections,
+        keepalive_expiry=settings.bitrix_http_keepalive_expiry,
+        connect_timeout=settings.bitrix_http_connect_timeout,
+        read_timeout=settings.bitrix_http_read_timeout
+    ))
+    
+    # Circuit breaker per provider, one retry budget shared by all of them
+    retry_budget = RetryBudget(
+        ratio=settings.provider_retry_budget_ratio,
+        min_per_second=settings.provider_retry_budget_min_per_second
+    )
+    for provider in (PaymentProviderType.MONOBANK, CRMProviderType.BITRIX):
+        resilience_policies.register(provider, ResiliencePolicy(
+            breaker=CircuitBreaker(
+                name=provider.value,
+                failure_threshold=settings.circuit_breaker_failure_threshold,
+                recovery_timeout=settings.circuit_breaker_recovery_seconds,
+                half_open_max_calls=settings.circuit_breaker_half_open_max_calls
+            ),
+            budget=retry_budget,
+            max_attempts=settings.provider_retry_max_attempts,
+            backoff_base=settings.provider_retry_backoff_base,
+            backoff_max=settings.provider_retry_backoff_max
+        ))
+    
+    # Evict cached products changed by other workers
+    if settings.catalog_notify_enabled:
+        catalog_listener.start()
+    
+    # Sync customers to CRM in background
+    if settings.crm_outbox_enabled:
+        crm_outbox_worker.start()
+    
+    # Process stored webhooks in background
+    if settings.webhook_worker_enabled:
+        webhook_worker.start()
+    
+    # Re-check payments whose callback was lost
+    if settings.payment_reconciler_enabled:
+        payment_reconciler.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Події при зупинці додатку"""
     logger.info("Shutting down SmartKasa Integration API...")
+    
+    await payment_reconciler.stop()
+    await webhook_worker.stop()
+    await crm_outbox_worker.stop()
+    await catalog_listener.stop()
+    await http_clients.close_all()
 
 
 @app.get("/")
@@ -65,7 +131,13 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Перевірка здоров'я додатку"""
-    return {"status": "healthy"}
+    return {"status": "healthy", "circuit_breakers": resilience_policies.stats()}
+
+
+@app.get("/health/db-pool")
+async def db_pool_health():
+    """Стан пулу з'єднань БД: зайняті з'єднання, overflow, гістограма очікування checkout"""
+    return pool_telemetry.snapshot(engine.pool)
 
 
 if __name__ == "__main__":
@@ -4,5 +4,8 @@ from .product import Product
 from .payment import Payment
 from .payment_item import PaymentItem
 from .log import Log
+from .crm_outbox import CRMOutboxJob
+from .webhook_event import WebhookEvent
+from .idempotency import IdempotencyRecord
 
-__all__ = ["Base", "Customer", "Product", "Payment", "PaymentItem", "Log"]
+__all__ = ["Base", "Customer", "Product", "Payment", "PaymentItem", "Log", "CRMOutboxJob", "WebhookEvent", "IdempotencyRecord"]
@@ -0,0 +1,28 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, Index, text
+from .base import BaseModel
+
+
+class CRMOutboxJob(BaseModel):
+    """CRM sync job, written in the same transaction as the customer (transactional outbox)"""
+    __tablename__ = "crm_outbox"
+
+    customer_id = Column(Integer, ForeignKey("customers.id", ondelete="CASCADE"), nullable=False)
+    operation = Column(String(50), nullable=False)  # sync_contact
+    payload = Column(Text, nullable=False)  # JSON
+    status = Column(String(20), nullable=False, default="pending")  # pending, processing, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_until = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_crm_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+        # At most one active job per customer; enqueue relies on it for ON CONFLICT
+        Index(
+            "uq_crm_outbox_active_customer",
+            "customer_id",
+            unique=True,
+            postgresql_where=text("status IN ('pending', 'processing')")
+        ),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String
+from sqlalchemy import Column, String, Index
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
@@ -16,3 +16,8 @@ class Customer(BaseModel):
     
     payments = relationship("Payment", back_populates="customer")
     payment_items = relationship("PaymentItem", back_populates="customer")
+    
+    __table_args__ = (
+        # Keyset pagination of the customers list
+        Index("ix_customers_created_at_id", "created_at", "id"),
+    )
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, Text, DateTime
+from .base import BaseModel
+
+
+class IdempotencyRecord(BaseModel):
+    """Stored result of an idempotent request, keyed by idempotency key"""
+    __tablename__ = "idempotency_records"
+
+    key = Column(String(255), nullable=False, unique=True)
+    request_hash = Column(String(64), nullable=False)  # sha256 of the request body
+    status = Column(String(20), nullable=False, default="in_progress")  # in_progress, completed
+    response = Column(Text, nullable=True)  # JSON
+    locked_until = Column(DateTime, nullable=True)  # lease of the in-progress request
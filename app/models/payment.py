@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, Text, Integer, ForeignKey
+from sqlalchemy import Column, String, Float, Text, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
@@ -9,11 +9,19 @@ class Payment(BaseModel):
     
     external_id = Column(String(255), unique=True, index=True)
     store_order_id = Column(String(255), index=True)
-    customer_id = Column(Integer, ForeignKey("customers.id"))
+    customer_id = Column(Integer, ForeignKey("customers.id"), index=True)
     total_sum = Column(Float, nullable=False)
     status = Column(String(50), default="pending")
     invoice_data = Column(Text)  # JSON
     products_data = Column(Text)  # JSON
     
     customer = relationship("Customer", back_populates="payments")
-    items = relationship("PaymentItem", back_populates="payment")
\ No newline at end of file
+    items = relationship("PaymentItem", back_populates="payment")
+    
+    __table_args__ = (
+        # Reconciler keyset scan over non-final payments; its (status) and
+        # (status, created_at) prefixes also serve plain status filters
+        Index("ix_payments_status_created_at_id", "status", "created_at", "id"),
+        # Keyset pagination of the payments list
+        Index("ix_payments_created_at_id", "created_at", "id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey
+from sqlalchemy import Column, Integer, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
@@ -7,9 +7,9 @@ class PaymentItem(BaseModel):
     """Payment item model - зв'язок між Payment та Product"""
     __tablename__ = "payment_items"
     
-    payment_id = Column(Integer, ForeignKey("payments.id"), nullable=False)
-    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
-    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False)  # Прямий зв'язок з Customer
+    payment_id = Column(Integer, ForeignKey("payments.id"), nullable=False, index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
+    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False, index=True)  # Прямий зв'язок з Customer
     quantity = Column(Integer, nullable=False)
     unit_price = Column(Float, nullable=False)
     total_price = Column(Float, nullable=False)
@@ -17,3 +17,8 @@ class PaymentItem(BaseModel):
     payment = relationship("Payment", back_populates="items")
     product = relationship("Product", back_populates="payment_items")
     customer = relationship("Customer", back_populates="payment_items")
+    
+    __table_args__ = (
+        # Date-range export ordered by (created_at, id)
+        Index("ix_payment_items_created_at_id", "created_at", "id"),
+    )
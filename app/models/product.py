@@ -1,6 +1,9 @@
-from sqlalchemy import Column, String, Float, Boolean
+from sqlalchemy import Column, String, Float, Boolean, Sequence, Index
 from sqlalchemy.orm import relationship
-from .base import BaseModel
+from .base import Base, BaseModel
+
+# Bumped on every product write; price quotes are only valid for the version they were made at
+catalog_version_seq = Sequence("catalog_version_seq", metadata=Base.metadata)
 
 
 class Product(BaseModel):
@@ -13,4 +16,9 @@ class Product(BaseModel):
     description = Column(String(500), nullable=True)
     photo = Column(String(500), nullable=True)
     
-    payment_items = relationship("PaymentItem", back_populates="product")
\ No newline at end of file
+    payment_items = relationship("PaymentItem", back_populates="product")
+    
+    __table_args__ = (
+        # Keyset pagination of the products list
+        Index("ix_products_created_at_id", "created_at", "id"),
+    )
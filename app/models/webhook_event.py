@@ -0,0 +1,21 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Text, Integer, DateTime, Index
+from .base import BaseModel
+
+
+class WebhookEvent(BaseModel):
+    """Raw incoming webhook, stored before processing (durable queue)"""
+    __tablename__ = "webhook_events"
+
+    provider = Column(String(50), nullable=False)  # monobank
+    event_key = Column(String(64), nullable=False, unique=True)  # sha256 of body, drops redeliveries
+    body = Column(Text, nullable=False)
+    status = Column(String(20), nullable=False, default="pending")  # pending, processing, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_until = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_webhook_events_status_next_attempt_at", "status", "next_attempt_at"),
+    )
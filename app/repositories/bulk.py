@@ -0,0 +1,75 @@
+from datetime import datetime
+from typing import Iterator, List, Type
+from sqlalchemy import Column, delete, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Rows per statement; keeps bind parameters well below the asyncpg limit (32767)
+BULK_CHUNK_SIZE = 1000
+
+# Columns never overwritten by an upsert
+_UPSERT_IMMUTABLE_COLUMNS = {"id", "created_at"}
+
+
+def _chunks(rows: List[dict], size: int = BULK_CHUNK_SIZE) -> Iterator[List[dict]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+async def bulk_insert(session: AsyncSession, model: Type, rows: List[dict]) -> list:
+    """Insert rows as multi-row INSERT ... RETURNING, preserving input order"""
+    if not rows:
+        return []
+
+    result = await session.scalars(
+        insert(model).returning(model, sort_by_parameter_order=True),
+        rows
+    )
+    return result.all()
+
+
+async def bulk_upsert(session: AsyncSession, model: Type, rows: List[dict], conflict_column: Column) -> list:
+    """INSERT ... ON CONFLICT (conflict_column) DO UPDATE ... RETURNING
+
+    All rows must have the same keys. Rows repeating a conflict key are
+    collapsed (last one wins), since Postgres rejects a statement that
+    updates the same row twice. Rows with a NULL conflict key never
+    conflict, so each of them is inserted.
+    """
+    key = conflict_column.key
+    unique_rows = list({row[key]: row for row in rows if row.get(key) is not None}.values())
+    unique_rows += [row for row in rows if row.get(key) is None]
+    if not unique_rows:
+        return []
+
+    update_columns = set(unique_rows[0]) - _UPSERT_IMMUTABLE_COLUMNS - {key}
+
+    upserted = []
+    for chunk in _chunks(unique_rows):
+        stmt = pg_insert(model).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[conflict_column],
+            set_={
+                **{column: stmt.excluded[column] for column in update_columns},
+                "updated_at": datetime.utcnow()
+            }
+        )
+        result = await session.scalars(
+            stmt.returning(model),
+            execution_options={"populate_existing": True}
+        )
+        upserted.extend(result.all())
+    return upserted
+
+
+async def bulk_delete(session: AsyncSession, model: Type, ids: List[int]) -> int:
+    """Delete rows by primary key with a single DELETE ... WHERE id IN (...)"""
+    if not ids:
+        return 0
+
+    result = await session.execute(
+        delete(model)
+        .where(model.id.in_(set(ids)))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
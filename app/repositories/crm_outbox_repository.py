@@ -0,0 +1,35 @@
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import List
+import json
+from app.repositories.base import LeaseQueueRepository
+from app.models.crm_outbox import CRMOutboxJob
+
+
+class CRMOutboxRepository(LeaseQueueRepository):
+    """Repository for CRM outbox jobs"""
+    
+    model = CRMOutboxJob
+    claim_order = ("next_attempt_at", "id")
+    
+    async def enqueue(self, customer_id: int, operation: str, payload: dict) -> bool:
+        """Add job unless the customer already has an active one"""
+        result = await self.session.execute(
+            pg_insert(CRMOutboxJob)
+            .values(customer_id=customer_id, operation=operation, payload=json.dumps(payload))
+            .on_conflict_do_nothing(
+                index_elements=[CRMOutboxJob.customer_id],
+                index_where=text("status IN ('pending', 'processing')")
+            )
+            .returning(CRMOutboxJob.id)
+        )
+        created = result.scalar_one_or_none() is not None
+        await self._commit()
+        return created
+    
+    async def get_by_customer_id(self, customer_id: int) -> List[CRMOutboxJob]:
+        """Get jobs for a customer"""
+        result = await self.session.execute(
+            select(CRMOutboxJob).where(CRMOutboxJob.customer_id == customer_id)
+        )
+        return result.scalars().all()
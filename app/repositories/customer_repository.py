@@ -1,23 +1,58 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Optional, List
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Dict, Optional, List, Tuple
+from datetime import datetime
+from app.repositories.base import BaseRepository
+from app.core.pagination import Cursor
+from app.repositories import bulk
+from app.repositories.pagination import keyset_page
 from app.models.customer import Customer
 
 
-class CustomerRepository:
+class CustomerRepository(BaseRepository):
     """Repository for Customer operations"""
     
-    def __init__(self, session: AsyncSession):
-        self.session = session
-    
     async def create(self, customer_data: dict) -> Customer:
         """Create customer"""
         customer = Customer(**customer_data)
         self.session.add(customer)
-        await self.session.commit()
-        await self.session.refresh(customer)
+        await self._commit(customer)
         return customer
     
+    async def bulk_create(self, customers_data: List[dict]) -> List[Customer]:
+        """Create customers with one multi-row INSERT ... RETURNING"""
+        customers = await bulk.bulk_insert(self.session, Customer, customers_data)
+        await self._commit()
+        return customers
+    
+    async def bulk_upsert(self, customers_data: List[dict]) -> List[Customer]:
+        """Create or update customers by phone with INSERT ... ON CONFLICT"""
+        customers = await bulk.bulk_upsert(self.session, Customer, customers_data, Customer.phone)
+        await self._commit()
+        return customers
+    
+    async def get_or_create_by_phone(self, customer_data: dict) -> Tuple[Customer, bool]:
+        """Atomically create customer or return existing one by phone
+        
+        INSERT ... ON CONFLICT (phone) DO NOTHING RETURNING never raises on a
+        concurrent insert of the same phone: Postgres waits for the other
+        transaction and skips the row, and the follow-up select returns it.
+        """
+        stmt = (
+            pg_insert(Customer)
+            .values(**customer_data)
+            .on_conflict_do_nothing(index_elements=[Customer.phone])
+            .returning(Customer)
+        )
+        result = await self.session.scalars(stmt, execution_options={"populate_existing": True})
+        customer = result.one_or_none()
+        
+        if customer is not None:
+            await self._commit()
+            return customer, True
+        
+        return await self.get_by_phone(customer_data["phone"]), False
+    
     async def get_by_id(self, customer_id: int) -> Optional[Customer]:
         """Get customer by ID"""
         result = await self.session.execute(
@@ -39,22 +74,41 @@ class CustomerRepository:
         )
         return result.scalar_one_or_none()
     
-    async def get_all(self) -> List[Customer]:
-        """Get all customers"""
-        result = await self.session.execute(select(Customer))
+    async def get_page(self, limit: int, after: Optional[Cursor] = None) -> List[Customer]:
+        """Get up to limit + 1 customers after a keyset position, ordered by (created_at, id)"""
+        result = await self.session.execute(keyset_page(select(Customer), Customer, limit, after))
         return result.scalars().all()
     
     async def update(self, customer: Customer) -> Customer:
         """Update customer"""
-        await self.session.commit()
-        await self.session.refresh(customer)
+        await self._commit(customer)
         return customer
     
+    async def set_bitrix_ids(self, bitrix_ids: Dict[int, Optional[str]]) -> None:
+        """Set bitrix_id for many customers (customer_id -> bitrix_id) in one executemany"""
+        if not bitrix_ids:
+            return
+        
+        await self.session.execute(
+            update(Customer),
+            [
+                {"id": customer_id, "bitrix_id": bitrix_id, "updated_at": datetime.utcnow()}
+                for customer_id, bitrix_id in bitrix_ids.items()
+            ]
+        )
+        await self._commit()
+    
     async def delete(self, customer_id: int) -> bool:
         """Delete customer"""
         customer = await self.get_by_id(customer_id)
         if customer:
             await self.session.delete(customer)
-            await self.session.commit()
+            await self._commit()
             return True
         return False
+    
+    async def bulk_delete(self, customer_ids: List[int]) -> int:
+        """Delete customers by IDs with a single statement"""
+        deleted = await bulk.bulk_delete(self.session, Customer, customer_ids)
+        await self._commit()
+        return deleted
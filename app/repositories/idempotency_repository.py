@@ -0,0 +1,79 @@
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from app.repositories.base import BaseRepository
+from app.models.idempotency import IdempotencyRecord
+
+
+class IdempotencyRepository(BaseRepository):
+    """Repository for idempotency records"""
+    
+    async def claim(
+        self,
+        key: str,
+        request_hash: str,
+        lease_seconds: float
+    ) -> Tuple[IdempotencyRecord, bool]:
+        """Claim key for processing; return (record, claimed)
+        
+        Not claimed means the key already exists: either completed, or in
+        progress under a lease that hasn't expired yet. An expired lease
+        (the owner died mid-request) is taken over.
+        """
+        now = datetime.utcnow()
+        locked_until = now + timedelta(seconds=lease_seconds)
+        
+        result = await self.session.scalars(
+            pg_insert(IdempotencyRecord)
+            .values(key=key, request_hash=request_hash, status="in_progress", locked_until=locked_until)
+            .on_conflict_do_nothing(index_elements=[IdempotencyRecord.key])
+            .returning(IdempotencyRecord)
+        )
+        record = result.one_or_none()
+        if record is None:
+            result = await self.session.scalars(
+                update(IdempotencyRecord)
+                .where(
+                    IdempotencyRecord.key == key,
+                    IdempotencyRecord.status == "in_progress",
+                    or_(IdempotencyRecord.locked_until.is_(None), IdempotencyRecord.locked_until < now)
+                )
+                .values(request_hash=request_hash, locked_until=locked_until, updated_at=now)
+                .returning(IdempotencyRecord)
+                .execution_options(synchronize_session=False),
+                execution_options={"populate_existing": True}
+            )
+            record = result.one_or_none()
+        
+        claimed = record is not None
+        if not claimed:
+            record = await self.get_by_key(key)
+        await self._commit()
+        return record, claimed
+    
+    async def get_by_key(self, key: str) -> Optional[IdempotencyRecord]:
+        """Get record by key"""
+        result = await self.session.execute(
+            select(IdempotencyRecord).where(IdempotencyRecord.key == key)
+        )
+        return result.scalar_one_or_none()
+    
+    async def complete(self, key: str, response: str) -> None:
+        """Store response and release the lease"""
+        await self.session.execute(
+            update(IdempotencyRecord)
+            .where(IdempotencyRecord.key == key)
+            .values(status="completed", response=response, locked_until=None, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        await self._commit()
+    
+    async def release(self, key: str) -> None:
+        """Drop an unfinished claim so the request can be retried"""
+        await self.session.execute(
+            delete(IdempotencyRecord)
+            .where(IdempotencyRecord.key == key, IdempotencyRecord.status == "in_progress")
+            .execution_options(synchronize_session=False)
+        )
+        await self._commit()
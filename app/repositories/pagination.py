@@ -0,0 +1,14 @@
+from typing import Optional, Type
+from sqlalchemy import Select, tuple_
+from app.core.pagination import Cursor
+
+
+def keyset_page(query: Select, model: Type, limit: int, after: Optional[Cursor] = None) -> Select:
+    """Order query by (created_at, id) and take up to limit + 1 rows after a position
+
+    Needs an index on (created_at, id) of the model's table; the extra row
+    tells the caller whether another page follows.
+    """
+    if after is not None:
+        query = query.where(tuple_(model.created_at, model.id) > tuple_(*after))
+    return query.order_by(model.created_at, model.id).limit(limit + 1)
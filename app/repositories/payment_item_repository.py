@@ -1,23 +1,35 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Optional, List
+from sqlalchemy import delete, select
+from sqlalchemy.engine import RowMapping
+from typing import AsyncIterator, Optional, List, Sequence
+from datetime import datetime
+from app.repositories.base import BaseRepository
+from app.repositories import bulk, streaming
+from app.models.payment import Payment
 from app.models.payment_item import PaymentItem
 
 
-class PaymentItemRepository:
+class PaymentItemRepository(BaseRepository):
     """Repository for PaymentItem operations"""
     
-    def __init__(self, session: AsyncSession):
-        self.session = session
-    
     async def create(self, payment_item_data: dict) -> PaymentItem:
         """Create payment item"""
         payment_item = PaymentItem(**payment_item_data)
         self.session.add(payment_item)
-        await self.session.commit()
-        await self.session.refresh(payment_item)
+        await self._commit(payment_item)
         return payment_item
     
+    async def bulk_create(self, payment_items_data: List[dict]) -> List[PaymentItem]:
+        """Create payment items with one multi-row INSERT ... RETURNING"""
+        payment_items = await bulk.bulk_insert(self.session, PaymentItem, payment_items_data)
+        await self._commit()
+        return payment_items
+    
+    def add_many(self, payment: Payment, items_data: List[dict]) -> List[PaymentItem]:
+        """Stage payment items for a payment without flushing"""
+        payment_items = [PaymentItem(payment=payment, **item_data) for item_data in items_data]
+        self.session.add_all(payment_items)
+        return payment_items
+    
     async def get_by_id(self, item_id: int) -> Optional[PaymentItem]:
         """Get payment item by ID"""
         result = await self.session.execute(
@@ -46,10 +58,21 @@ class PaymentItemRepository:
         )
         return result.scalars().all()
     
+    def stream_for_export(
+        self,
+        columns: Sequence[str],
+        created_from: Optional[datetime],
+        created_to: Optional[datetime],
+        batch_size: int
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """Stream payment items created in [created_from, created_to) in batches of column mappings"""
+        return streaming.stream_created_between(
+            self.session, PaymentItem, columns, created_from, created_to, batch_size
+        )
+    
     async def update(self, payment_item: PaymentItem) -> PaymentItem:
         """Update payment item"""
-        await self.session.commit()
-        await self.session.refresh(payment_item)
+        await self._commit(payment_item)
         return payment_item
     
     async def delete(self, item_id: int) -> bool:
@@ -57,19 +80,22 @@ class PaymentItemRepository:
         payment_item = await self.get_by_id(item_id)
         if payment_item:
             await self.session.delete(payment_item)
-            await self.session.commit()
+            await self._commit()
             return True
         return False
     
+    async def bulk_delete(self, payment_item_ids: List[int]) -> int:
+        """Delete payment items by IDs with a single statement"""
+        deleted = await bulk.bulk_delete(self.session, PaymentItem, payment_item_ids)
+        await self._commit()
+        return deleted
+    
     async def delete_by_payment_id(self, payment_id: int) -> int:
         """Delete all payment items for a payment"""
         result = await self.session.execute(
-            select(PaymentItem).where(PaymentItem.payment_id == payment_id)
+            delete(PaymentItem)
+            .where(PaymentItem.payment_id == payment_id)
+            .execution_options(synchronize_session=False)
         )
-        items = result.scalars().all()
-        
-        for item in items:
-            await self.session.delete(item)
-        
-        await self.session.commit()
-        return len(items)
+        await self._commit()
+        return result.rowcount
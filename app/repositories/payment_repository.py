@@ -1,21 +1,40 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Optional, List
+from sqlalchemy import select, update, tuple_
+from sqlalchemy.engine import RowMapping
+from typing import AsyncIterator, Collection, Optional, List, Sequence, Tuple
+from datetime import datetime
+from app.repositories.base import BaseRepository
+from app.core.pagination import Cursor
+from app.repositories import bulk, streaming
+from app.repositories.pagination import keyset_page
 from app.models.payment import Payment
 
 
-class PaymentRepository:
+class PaymentRepository(BaseRepository):
     """Repository for Payment operations"""
     
-    def __init__(self, session: AsyncSession):
-        self.session = session
-    
     async def create(self, payment_data: dict) -> Payment:
         """Create payment"""
         payment = Payment(**payment_data)
         self.session.add(payment)
-        await self.session.commit()
-        await self.session.refresh(payment)
+        await self._commit(payment)
+        return payment
+    
+    async def bulk_create(self, payments_data: List[dict]) -> List[Payment]:
+        """Create payments with one multi-row INSERT ... RETURNING"""
+        payments = await bulk.bulk_insert(self.session, Payment, payments_data)
+        await self._commit()
+        return payments
+    
+    async def bulk_upsert(self, payments_data: List[dict]) -> List[Payment]:
+        """Create or update payments by external ID with INSERT ... ON CONFLICT"""
+        payments = await bulk.bulk_upsert(self.session, Payment, payments_data, Payment.external_id)
+        await self._commit()
+        return payments
+    
+    def add(self, payment_data: dict) -> Payment:
+        """Stage payment without flushing"""
+        payment = Payment(**payment_data)
+        self.session.add(payment)
         return payment
     
     async def get_by_id(self, payment_id: int) -> Optional[Payment]:
@@ -46,17 +65,111 @@ class PaymentRepository:
         )
         return result.scalars().all()
     
+    async def get_page(self, limit: int, after: Optional[Cursor] = None) -> List[Payment]:
+        """Get up to limit + 1 payments after a keyset position, ordered by (created_at, id)"""
+        result = await self.session.execute(keyset_page(select(Payment), Payment, limit, after))
+        return result.scalars().all()
+    
+    def stream_for_export(
+        self,
+        columns: Sequence[str],
+        created_from: Optional[datetime],
+        created_to: Optional[datetime],
+        batch_size: int
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """Stream payments created in [created_from, created_to) in batches of column mappings"""
+        return streaming.stream_created_between(
+            self.session, Payment, columns, created_from, created_to, batch_size
+        )
+    
     async def update(self, payment: Payment) -> Payment:
         """Update payment"""
-        await self.session.commit()
-        await self.session.refresh(payment)
+        await self._commit(payment)
         return payment
     
+    async def get_status_by_external_id(self, external_id: str) -> Optional[str]:
+        """Get only the status column by external ID"""
+        result = await self.session.execute(
+            select(Payment.status).where(Payment.external_id == external_id)
+        )
+        return result.scalar_one_or_none()
+    
+    async def transition_status(
+        self,
+        external_id: str,
+        new_status: str,
+        from_statuses: Collection[str]
+    ) -> bool:
+        """Set status only if the current one is in from_statuses (conditional UPDATE)
+        
+        The check and the write are one statement, so concurrent callbacks
+        cannot both apply a transition from the same status.
+        """
+        result = await self.session.execute(
+            update(Payment)
+            .where(Payment.external_id == external_id, Payment.status.in_(list(from_statuses)))
+            .values(status=new_status, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        await self._commit()
+        return result.rowcount == 1
+    
+    async def transition_status_many(
+        self,
+        external_ids: Collection[str],
+        new_status: str,
+        from_statuses: Collection[str]
+    ) -> List[str]:
+        """Conditional status UPDATE for many payments, return external IDs actually changed"""
+        if not external_ids:
+            return []
+        
+        result = await self.session.execute(
+            update(Payment)
+            .where(Payment.external_id.in_(list(external_ids)), Payment.status.in_(list(from_statuses)))
+            .values(status=new_status, updated_at=datetime.utcnow())
+            .returning(Payment.external_id)
+            .execution_options(synchronize_session=False)
+        )
+        changed = list(result.scalars().all())
+        await self._commit()
+        return changed
+    
+    async def get_page_by_status(
+        self,
+        statuses: Collection[str],
+        created_before: datetime,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: int = 100
+    ) -> List[Payment]:
+        """Payments in statuses created before a time, keyset-paginated by (created_at, id)"""
+        query = (
+            select(Payment)
+            .where(
+                Payment.status.in_(list(statuses)),
+                Payment.created_at < created_before,
+                Payment.external_id.is_not(None)
+            )
+            .order_by(Payment.created_at, Payment.id)
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.where(tuple_(Payment.created_at, Payment.id) > tuple_(*after))
+        
+        result = await self.session.execute(query)
+        return result.scalars().all()
+    
     async def delete(self, payment_id: int) -> bool:
         """Delete payment"""
         payment = await self.get_by_id(payment_id)
         if payment:
             await self.session.delete(payment)
-            await self.session.commit()
+            await self._commit()
             return True
         return False
+    
+    async def bulk_delete(self, payment_ids: List[int]) -> int:
+        """Delete payments by IDs with a single statement"""
+        deleted = await bulk.bulk_delete(self.session, Payment, payment_ids)
+        await self._commit()
+        return deleted
@@ -1,23 +1,34 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select, text
 from typing import Optional, List
-from app.models.product import Product
+from app.repositories.base import BaseRepository
+from app.core.pagination import Cursor
+from app.repositories import bulk
+from app.repositories.pagination import keyset_page
+from app.models.product import Product, catalog_version_seq
 
 
-class ProductRepository:
+class ProductRepository(BaseRepository):
     """Repository for Product operations"""
     
-    def __init__(self, session: AsyncSession):
-        self.session = session
-    
     async def create(self, product_data: dict) -> Product:
         """Create product"""
         product = Product(**product_data)
         self.session.add(product)
-        await self.session.commit()
-        await self.session.refresh(product)
+        await self._commit(product)
         return product
     
+    async def bulk_create(self, products_data: List[dict]) -> List[Product]:
+        """Create products with one multi-row INSERT ... RETURNING"""
+        products = await bulk.bulk_insert(self.session, Product, products_data)
+        await self._commit()
+        return products
+    
+    async def bulk_upsert(self, products_data: List[dict]) -> List[Product]:
+        """Create or update products by SKU with INSERT ... ON CONFLICT"""
+        products = await bulk.bulk_upsert(self.session, Product, products_data, Product.sku)
+        await self._commit()
+        return products
+    
     async def get_by_id(self, product_id: int) -> Optional[Product]:
         """Get product by ID"""
         result = await self.session.execute(
@@ -25,6 +36,16 @@ class ProductRepository:
         )
         return result.scalar_one_or_none()
     
+    async def get_many_by_ids(self, product_ids: List[int]) -> List[Product]:
+        """Get products by a list of IDs in a single query"""
+        if not product_ids:
+            return []
+        
+        result = await self.session.execute(
+            select(Product).where(Product.id.in_(set(product_ids)))
+        )
+        return result.scalars().all()
+    
     async def get_by_sku(self, sku: str) -> Optional[Product]:
         """Get product by SKU"""
         result = await self.session.execute(
@@ -32,22 +53,46 @@ class ProductRepository:
         )
         return result.scalar_one_or_none()
     
-    async def get_all_active(self) -> List[Product]:
-        """Get all products"""
-        result = await self.session.execute(select(Product))
+    async def get_page(self, limit: int, after: Optional[Cursor] = None) -> List[Product]:
+        """Get up to limit + 1 products after a keyset position, ordered by (created_at, id)"""
+        result = await self.session.execute(keyset_page(select(Product), Product, limit, after))
         return result.scalars().all()
     
     async def update(self, product: Product) -> Product:
         """Update product"""
-        await self.session.commit()
-        await self.session.refresh(product)
+        await self._commit(product)
         return product
     
+    async def notify(self, channel: str, payload: str) -> None:
+        """Send Postgres NOTIFY; delivered to listeners when the transaction commits"""
+        await self.session.execute(select(func.pg_notify(channel, payload)))
+        await self._commit()
+    
+    async def bump_catalog_version(self) -> int:
+        """Advance the catalog version; nextval is not transactional, no commit needed"""
+        return await self.session.scalar(select(catalog_version_seq.next_value()))
+    
+    async def get_catalog_version(self) -> int:
+        """Current catalog version; 0 until the first bump
+        
+        Before the first nextval last_value already holds the start value, which
+        the first bump then returns, so it can't be reported as the version.
+        """
+        return await self.session.scalar(
+            text("SELECT CASE WHEN is_called THEN last_value ELSE 0 END FROM catalog_version_seq")
+        )
+    
     async def delete(self, product_id: int) -> bool:
         """Delete product"""
         product = await self.get_by_id(product_id)
         if product:
             await self.session.delete(product)
-            await self.session.commit()
+            await self._commit()
             return True
         return False
+    
+    async def bulk_delete(self, product_ids: List[int]) -> int:
+        """Delete products by IDs with a single statement"""
+        deleted = await bulk.bulk_delete(self.session, Product, product_ids)
+        await self._commit()
+        return deleted
@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import AsyncIterator, Optional, Sequence, Type
+from sqlalchemy import select
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def stream_created_between(
+    session: AsyncSession,
+    model: Type,
+    columns: Sequence[str],
+    created_from: Optional[datetime],
+    created_to: Optional[datetime],
+    batch_size: int
+) -> AsyncIterator[Sequence[RowMapping]]:
+    """Stream rows created in [created_from, created_to) in batches, ordered by (created_at, id)
+
+    Rows come from a server-side cursor as plain mappings (no ORM objects,
+    nothing kept in the identity map), so memory stays at one batch.
+    """
+    query = select(*(getattr(model, column) for column in columns)).order_by(model.created_at, model.id)
+    if created_from is not None:
+        query = query.where(model.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(model.created_at < created_to)
+
+    result = await session.stream(query.execution_options(yield_per=batch_size))
+    try:
+        async for batch in result.mappings().partitions():
+            yield batch
+    finally:
+        # Also on cancellation: closes the cursor so the query stops
+        await result.close()
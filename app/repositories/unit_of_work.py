@@ -0,0 +1,45 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.crm_outbox_repository import CRMOutboxRepository
+from app.repositories.customer_repository import CustomerRepository
+from app.repositories.idempotency_repository import IdempotencyRepository
+from app.repositories.payment_item_repository import PaymentItemRepository
+from app.repositories.payment_repository import PaymentRepository
+from app.repositories.product_repository import ProductRepository
+
+
+class UnitOfWork:
+    """Groups repository writes into a single transaction
+
+    Repositories created here never commit on their own: writes are staged
+    in the session and sent on flush, and only commit() ends the transaction.
+    Leaving the context with an exception rolls everything back, so a failed
+    step (e.g. a provider call after the flush) leaves no partial rows behind.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.customers = CustomerRepository(session, autocommit=False)
+        self.products = ProductRepository(session, autocommit=False)
+        self.payments = PaymentRepository(session, autocommit=False)
+        self.payment_items = PaymentItemRepository(session, autocommit=False)
+        self.crm_outbox = CRMOutboxRepository(session, autocommit=False)
+        self.idempotency = IdempotencyRepository(session, autocommit=False)
+
+    async def __aenter__(self) -> "UnitOfWork":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            await self.rollback()
+
+    async def flush(self) -> None:
+        """Send staged writes; generated IDs come back via INSERT ... RETURNING"""
+        await self.session.flush()
+
+    async def commit(self) -> None:
+        """Commit the transaction"""
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        """Discard all staged and flushed writes"""
+        await self.session.rollback()
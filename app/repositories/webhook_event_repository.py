@@ -0,0 +1,26 @@
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+import hashlib
+from app.repositories.base import LeaseQueueRepository
+from app.models.webhook_event import WebhookEvent
+
+
+class WebhookEventRepository(LeaseQueueRepository):
+    """Repository for stored webhook events, claimed in arrival order"""
+    
+    model = WebhookEvent
+    
+    async def enqueue(self, provider: str, body: bytes) -> bool:
+        """Store raw webhook body; identical redeliveries are dropped"""
+        result = await self.session.execute(
+            pg_insert(WebhookEvent)
+            .values(
+                provider=provider,
+                event_key=hashlib.sha256(body).hexdigest(),
+                body=body.decode()
+            )
+            .on_conflict_do_nothing(index_elements=[WebhookEvent.event_key])
+            .returning(WebhookEvent.id)
+        )
+        created = result.scalar_one_or_none() is not None
+        await self._commit()
+        return created
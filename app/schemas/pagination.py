@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """Сторінка списку з курсором наступної сторінки"""
+    items: List[T]
+    next_cursor: Optional[str] = None  # Передається як ?after=; None - остання сторінка
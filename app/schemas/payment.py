@@ -3,6 +3,8 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 from .payment_item import PaymentItemResponse
 
+MAX_BATCH_CARTS = 1000
+
 
 class ProductItemRequest(BaseModel):
     product_id: int
@@ -48,6 +50,7 @@ class PaymentRequest(BaseModel):
     available_programs: List[AvailableProgram]
     products: List[ProductItemRequest]  # Тільки ID та кількість
     result_callback: str
+    quote_token: Optional[str] = None  # Токен з /payments/calculate; без нього ціни рахуються заново
     
     @field_validator('products')
     @classmethod
@@ -62,6 +65,49 @@ class PaymentCalculationResponse(BaseModel):
     total_sum: float
     products: List[ProductItemResponse]
     calculated_at: datetime
+    quote_token: Optional[str] = None  # Підписані ціни для /payments/create
+    quote_expires_at: Optional[datetime] = None
+
+
+class CartCalculationRequest(BaseModel):
+    """Кошик для пакетного розрахунку"""
+    cart_id: Optional[str] = None  # Ідентифікатор партнера, повертається у відповіді
+    products: List[ProductItemRequest]
+    
+    @field_validator('products')
+    @classmethod
+    def validate_products_not_empty(cls, v):
+        if not v:
+            raise ValueError('Products list cannot be empty')
+        return v
+
+
+class BatchCalculationRequest(BaseModel):
+    """Запит на пакетний розрахунок кошиків"""
+    carts: List[CartCalculationRequest]
+    
+    @field_validator('carts')
+    @classmethod
+    def validate_carts(cls, v):
+        if not v:
+            raise ValueError('Carts list cannot be empty')
+        if len(v) > MAX_BATCH_CARTS:
+            raise ValueError(f'At most {MAX_BATCH_CARTS} carts per request')
+        return v
+
+
+class CartCalculationResult(BaseModel):
+    """Результат розрахунку одного кошика; error замість сум, якщо товар не знайдено"""
+    cart_id: Optional[str] = None
+    total_sum: Optional[float] = None
+    products: List[ProductItemResponse] = []
+    error: Optional[str] = None
+
+
+class BatchCalculationResponse(BaseModel):
+    """Відповідь пакетного розрахунку в порядку кошиків запиту"""
+    results: List[CartCalculationResult]
+    calculated_at: datetime
 
 
 class PaymentResponse(BaseModel):
@@ -77,7 +123,22 @@ class PaymentResponse(BaseModel):
 class PaymentStatus(BaseModel):
     """Статус платежу"""
     payment_id: int
-    external_id: str
+    external_id: Optional[str] = None
     status: str
     is_confirmed: bool
     total_sum: float
+
+
+class PaymentSummary(BaseModel):
+    """Платіж у списку платежів"""
+    id: int
+    external_id: Optional[str] = None
+    store_order_id: Optional[str] = None
+    customer_id: Optional[int] = None
+    status: Optional[str] = None
+    total_sum: float
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
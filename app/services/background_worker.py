@@ -0,0 +1,110 @@
+import asyncio
+from abc import ABC, abstractmethod
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def retry_at(attempts: int, max_attempts: int, base: float, maximum: float) -> Optional[datetime]:
+    """Next attempt time with jittered exponential backoff, None once attempts are exhausted"""
+    if attempts >= max_attempts:
+        return None
+    delay = min(maximum, base * 2 ** (attempts - 1))
+    return datetime.utcnow() + timedelta(seconds=random.uniform(delay / 2, delay))
+
+
+class BackgroundWorkerPool(ABC):
+    """Pool of asyncio tasks that repeatedly call run_once()
+
+    Subclasses implement run_once() to process one batch and return how many
+    items it handled. A loop that found nothing to do sleeps for
+    `poll_interval` seconds or until wake() is called.
+    """
+
+    name = "worker"
+
+    def __init__(self, concurrency: int = 1, poll_interval: float = 1.0):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @abstractmethod
+    async def run_once(self) -> int:
+        """Process one batch, return number of processed items"""
+        pass
+
+    def start(self) -> None:
+        """Start worker tasks"""
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._loop(index), name=f"{self.name}-{index}")
+            for index in range(self.concurrency)
+        ]
+        logger.info(f"Started {self.concurrency} {self.name} task(s)")
+
+    async def stop(self) -> None:
+        """Cancel worker tasks and wait for them to finish"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def wake(self) -> None:
+        """Make idle workers poll immediately"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _loop(self, index: int) -> None:
+        while True:
+            try:
+                processed = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"{self.name}-{index} failed: {str(e)}")
+                processed = 0
+
+            if processed:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+class LeaseQueueWorker(BackgroundWorkerPool):
+    """Worker pool draining a LeaseQueueRepository table
+
+    Rows are claimed in batches of `batch_size` under a `lease_seconds`
+    lease; failed rows are retried with jittered exponential backoff until
+    `max_attempts`, then left as failed.
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        poll_interval: float,
+        batch_size: int,
+        lease_seconds: float,
+        max_attempts: int,
+        backoff_base: float,
+        backoff_max: float
+    ):
+        super().__init__(concurrency=concurrency, poll_interval=poll_interval)
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def _retry_at(self, row) -> Optional[datetime]:
+        """Next attempt time for a failed row, None once attempts are exhausted"""
+        return retry_at(row.attempts, self.max_attempts, self.backoff_base, self.backoff_max)
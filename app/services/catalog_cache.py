@@ -0,0 +1,92 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import settings
+from app.core.cache import TTLCache
+from app.schemas.product import ProductResponse
+
+
+class CatalogCache:
+    """Process-wide cache of product snapshots, looked up by ID or SKU
+
+    Products are stored under their ID; SKU keys only point at the ID, so
+    evicting the ID entry is enough to stop serving a product by SKU too.
+    Snapshots are immutable ProductResponse objects, never ORM instances.
+    The catalog version is kept beside the cache, outside its hit/miss
+    stats, and expires after the same TTL as a product.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self._cache = TTLCache(max_size=max_size, ttl=ttl)
+        # (version, monotonic expiry time)
+        self._version: Optional[Tuple[int, float]] = None
+
+    def get_by_id(self, product_id: int) -> Optional[ProductResponse]:
+        """Get cached product by ID"""
+        return self._cache.get(("id", product_id))
+
+    def get_many_by_ids(self, product_ids: List[int]) -> Dict[int, ProductResponse]:
+        """Get cached products by IDs, skipping misses"""
+        found = {}
+        for product_id in product_ids:
+            product = self.get_by_id(product_id)
+            if product is not None:
+                found[product_id] = product
+        return found
+
+    def get_by_sku(self, sku: str) -> Optional[ProductResponse]:
+        """Get cached product by SKU"""
+        # Only the product lookup counts in stats; with no SKU pointer the
+        # ("id", None) key is a miss
+        product_id = self._cache.get(("sku", sku), record_stats=False)
+        product = self.get_by_id(product_id)
+        if product is None or product.sku != sku:
+            return None
+        return product
+
+    def put(self, product: ProductResponse) -> None:
+        """Cache product snapshot"""
+        self._cache.set(("id", product.id), product)
+        if product.sku:
+            self._cache.set(("sku", product.sku), product.id)
+
+    def invalidate(self, product_id: Optional[int] = None, sku: Optional[str] = None) -> None:
+        """Evict product by ID and/or SKU"""
+        if product_id is not None:
+            cached = self._cache.pop(("id", product_id))
+            if cached is not None and cached.sku:
+                self._cache.pop(("sku", cached.sku))
+        if sku is not None:
+            self._cache.pop(("sku", sku))
+
+    def get_version(self) -> Optional[int]:
+        """Cached catalog version"""
+        if self._version is None:
+            return None
+        version, expires_at = self._version
+        if expires_at <= time.monotonic():
+            self._version = None
+            return None
+        return version
+
+    def set_version(self, version: Optional[int]) -> None:
+        """Cache catalog version; never moves it back"""
+        if version is None:
+            return
+        current = self.get_version()
+        if current is None or version > current:
+            self._version = (version, time.monotonic() + self._cache.ttl)
+
+    def clear(self) -> None:
+        """Evict everything"""
+        self._cache.clear()
+        self._version = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters"""
+        return self._cache.stats()
+
+
+catalog_cache = CatalogCache(
+    max_size=settings.catalog_cache_max_size,
+    ttl=settings.catalog_cache_ttl_seconds
+)
@@ -0,0 +1,145 @@
+"""
+Cross-worker catalog cache invalidation over Postgres LISTEN/NOTIFY
+
+Every product write made through ProductService sends a notification on the
+channel configured by CATALOG_NOTIFY_CHANNEL (default "catalog_invalidation").
+The payload is a JSON object:
+
+    {"ids": [42], "skus": ["SKU-OLD", "SKU-NEW"], "version": 17}
+
+- "ids": product IDs whose cached entries must be evicted
+- "skus": SKU keys to evict; an update carries both the old and the new SKU
+- "version": catalog version after the write (catalog_version_seq), may be null
+
+A bulk write is split into several notifications of at most
+INVALIDATION_CHUNK_SIZE IDs and SKUs each, to stay under the 8000-byte
+NOTIFY payload limit.
+
+Each worker keeps one dedicated asyncpg connection with LISTEN on the channel
+and evicts the matching entries from its CatalogCache. Notifications sent
+while the connection is down are lost, so the cache is cleared on every
+(re)connect; the cache TTL bounds staleness while the listener is offline.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Iterable, Iterator, Optional
+import asyncpg
+from sqlalchemy.engine import make_url
+from app.config import settings
+from app.services.catalog_cache import CatalogCache, catalog_cache
+
+logger = logging.getLogger(__name__)
+
+
+INVALIDATION_CHUNK_SIZE = 50
+
+
+def build_invalidation_payloads(
+    product_ids: Iterable[int],
+    skus: Iterable[Optional[str]],
+    version: Optional[int] = None
+) -> Iterator[str]:
+    """Build NOTIFY payloads for a change of one or many products"""
+    product_ids = sorted(set(product_ids))
+    skus = sorted({sku for sku in skus if sku})
+    for start in range(0, max(len(product_ids), len(skus), 1), INVALIDATION_CHUNK_SIZE):
+        yield json.dumps({
+            "ids": product_ids[start:start + INVALIDATION_CHUNK_SIZE],
+            "skus": skus[start:start + INVALIDATION_CHUNK_SIZE],
+            "version": version
+        })
+
+
+def to_asyncpg_dsn(database_url: str) -> str:
+    """Convert SQLAlchemy URL (postgresql+asyncpg://) to a plain libpq DSN"""
+    return make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+class CatalogInvalidationListener:
+    """Background LISTEN subscription that evicts catalog cache entries"""
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str,
+        cache: CatalogCache,
+        reconnect_delay: float = 5.0,
+        health_check_interval: float = 30.0
+    ):
+        self.dsn = dsn
+        self.channel = channel
+        self.cache = cache
+        self.reconnect_delay = reconnect_delay
+        self.health_check_interval = health_check_interval
+        self.connected = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start listening in background"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop listening and close the connection"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Malformed catalog invalidation payload: {payload}")
+            return
+
+        for product_id in data.get("ids") or []:
+            self.cache.invalidate(product_id=product_id)
+        for sku in data.get("skus") or []:
+            self.cache.invalidate(sku=sku)
+        self.cache.set_version(data.get("version"))
+
+    async def _run(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(self.channel, self._on_notification)
+
+                # Anything published while we were offline is lost
+                self.cache.clear()
+                self.connected = True
+                logger.info(f"Listening for catalog invalidations on '{self.channel}'")
+
+                while not closed.is_set():
+                    try:
+                        await asyncio.wait_for(closed.wait(), self.health_check_interval)
+                    except asyncio.TimeoutError:
+                        await connection.execute("SELECT 1")
+
+                logger.warning("Catalog invalidation listener connection closed")
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Catalog invalidation listener failed: {str(e)}")
+            finally:
+                self.connected = False
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+
+            await asyncio.sleep(self.reconnect_delay)
+
+
+catalog_listener = CatalogInvalidationListener(
+    dsn=to_asyncpg_dsn(settings.database_url),
+    channel=settings.catalog_notify_channel,
+    cache=catalog_cache
+)
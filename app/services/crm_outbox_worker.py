@@ -0,0 +1,129 @@
+import json
+import logging
+from typing import Callable, Dict, Optional
+from app.config import settings
+from app.core.types.crm_types import ContactCheck, CRMProviderType
+from app.database import async_session
+from app.repositories.crm_outbox_repository import CRMOutboxRepository
+from app.repositories.customer_repository import CustomerRepository
+from app.schemas.customer import CustomerCreate
+from app.services.background_worker import LeaseQueueWorker
+from app.services.crm_provider_factory import CRMProviderFactory
+from app.services.crm_service import CRMService
+from app.services.customer_cache import customer_cache
+
+logger = logging.getLogger(__name__)
+
+
+def default_crm_service() -> CRMService:
+    return CRMService(CRMProviderFactory.create_provider(CRMProviderType.BITRIX))
+
+
+class CRMOutboxWorker(LeaseQueueWorker):
+    """Drains the CRM outbox: links customers to Bitrix24 contacts in batches
+
+    Each run leases up to `batch_size` due jobs, validates the Bitrix IDs
+    customers came with (a mismatch falls back to creating a new contact,
+    a failed check retries the job),
+    creates the missing contacts through the batch API and stores the
+    resulting bitrix_id. Failed jobs are retried with jittered exponential
+    backoff until `max_attempts`, then left as failed.
+    """
+
+    name = "crm-outbox"
+
+    def __init__(
+        self,
+        concurrency: int,
+        poll_interval: float,
+        batch_size: int,
+        lease_seconds: float,
+        max_attempts: int,
+        backoff_base: float,
+        backoff_max: float,
+        crm_service_factory: Callable[[], CRMService] = default_crm_service
+    ):
+        super().__init__(
+            concurrency, poll_interval, batch_size, lease_seconds, max_attempts, backoff_base, backoff_max
+        )
+        self.crm_service_factory = crm_service_factory
+
+    async def run_once(self) -> int:
+        async with async_session() as session:
+            outbox = CRMOutboxRepository(session)
+            jobs = await outbox.claim_batch(self.batch_size, self.lease_seconds)
+            if not jobs:
+                return 0
+
+            payloads = {job.id: json.loads(job.payload) for job in jobs}
+            crm_service = self.crm_service_factory()
+            bitrix_ids: Dict[int, Optional[str]] = {}
+            errors: Dict[int, str] = {}
+
+            # 1. Check Bitrix IDs customers came with
+            to_validate = [job for job in jobs if payloads[job.id].get("bitrix_id")]
+            to_create = [job for job in jobs if not payloads[job.id].get("bitrix_id")]
+
+            if to_validate:
+                try:
+                    checks = await crm_service.validate_contact_ids_by_phone([
+                        (payloads[job.id]["bitrix_id"], payloads[job.id]["phone"])
+                        for job in to_validate
+                    ])
+                    for job, check in zip(to_validate, checks):
+                        if check == ContactCheck.ERROR:
+                            # Unknown, not wrong: keep the ID and retry the job
+                            errors[job.id] = f"Validation of Bitrix ID {payloads[job.id]['bitrix_id']} failed"
+                        elif check == ContactCheck.MISMATCH:
+                            logger.warning(
+                                f"Bitrix ID {payloads[job.id]['bitrix_id']} doesn't match phone "
+                                f"{payloads[job.id]['phone']}, creating new contact"
+                            )
+                            bitrix_ids[job.customer_id] = None
+                            to_create.append(job)
+                except Exception as e:
+                    for job in to_validate:
+                        errors[job.id] = f"Validation failed: {str(e)}"
+
+            # 2. Create missing contacts
+            if to_create:
+                try:
+                    results = await crm_service.create_contacts_from_customers([
+                        CustomerCreate(**{**payloads[job.id], "bitrix_id": None})
+                        for job in to_create
+                    ])
+                    for job, result in zip(to_create, results):
+                        if result.get("result"):
+                            bitrix_ids[job.customer_id] = str(result["result"])
+                        else:
+                            errors[job.id] = f"Contact creation failed: {result.get('error')}"
+                except Exception as e:
+                    for job in to_create:
+                        errors[job.id] = f"Contact creation failed: {str(e)}"
+
+            # 3. Store results and settle jobs in one transaction
+            await CustomerRepository(session, autocommit=False).set_bitrix_ids(bitrix_ids)
+            for job in jobs:
+                if job.id in errors:
+                    outbox.mark_failed(job, errors[job.id], self._retry_at(job))
+                else:
+                    outbox.mark_done(job)
+            await session.commit()
+
+        customer_cache.invalidate(*(payloads[job.id]["phone"] for job in jobs))
+        if errors:
+            logger.warning(f"CRM outbox: {len(jobs) - len(errors)} synced, {len(errors)} failed")
+        else:
+            logger.info(f"CRM outbox: {len(jobs)} synced")
+        return len(jobs)
+
+
+crm_outbox_worker = CRMOutboxWorker(
+    concurrency=settings.crm_outbox_workers,
+    poll_interval=settings.crm_outbox_poll_interval,
+    batch_size=settings.crm_outbox_batch_size,
+    lease_seconds=settings.crm_outbox_lease_seconds,
+    max_attempts=settings.crm_outbox_max_attempts,
+    backoff_base=settings.crm_outbox_backoff_base,
+    backoff_max=settings.crm_outbox_backoff_max
+)
@@ -1,6 +1,9 @@
 from typing import Dict, Type
 from app.core.interfaces.crm_provider import CRMProviderInterface
 from app.core.types.crm_types import CRMProviderType
+from app.core.http_client import http_clients
+from app.core.rate_limiter import TokenBucket
+from app.core.resilience import resilience_policies
 from app.services.crm_service import BitrixService
 from app.config import settings
 import logging
@@ -17,6 +20,9 @@ class CRMProviderFactory:
         "hubspot": None,     # Future implementation
     }
     
+    # One limiter per Bitrix24 portal, shared by all service instances
+    _rate_limiters: Dict[str, TokenBucket] = {}
+    
     @classmethod
     def create_provider(cls, provider_type: CRMProviderType, **kwargs) -> CRMProviderInterface:
         """Create CRM provider instance"""
@@ -30,12 +36,26 @@ class CRMProviderFactory:
             raise NotImplementedError(f"CRM provider {provider_type} not implemented yet")
         
         if provider_type == CRMProviderType.BITRIX:
+            webhook_url = kwargs.get("webhook_url", settings.bitrix_webhook_url)
             return provider_class(
-                webhook_url=kwargs.get("webhook_url", settings.bitrix_webhook_url)
+                webhook_url=webhook_url,
+                http_client=kwargs.get("http_client") or http_clients.get(CRMProviderType.BITRIX),
+                rate_limiter=kwargs.get("rate_limiter") or cls.get_rate_limiter(webhook_url),
+                resilience=kwargs.get("resilience") or resilience_policies.get(CRMProviderType.BITRIX)
             )
         else:
             return provider_class(**kwargs)
     
+    @classmethod
+    def get_rate_limiter(cls, webhook_url: str) -> TokenBucket:
+        """Get shared rate limiter for Bitrix24 portal"""
+        if webhook_url not in cls._rate_limiters:
+            cls._rate_limiters[webhook_url] = TokenBucket(
+                rate=settings.bitrix_rate_limit_per_second,
+                capacity=settings.bitrix_rate_limit_burst
+            )
+        return cls._rate_limiters[webhook_url]
+    
     @classmethod
     def register_provider(cls, name: str, provider_class: Type[CRMProviderInterface]):
         """Register new CRM provider type"""
@@ -1,27 +1,130 @@
+import asyncio
 import httpx
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlencode
 from app.config import settings
-from app.core.interfaces.crm_provider import CRMProviderInterface
+from app.core.interfaces.crm_provider import BatchCRMProviderInterface, CRMProviderInterface
+from app.core.types.crm_types import ContactCheck
+from app.core.rate_limiter import TokenBucket
+from app.core.resilience import ResiliencePolicy
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of commands Bitrix24 accepts in one batch request
+BITRIX_BATCH_LIMIT = 50
 
-class BitrixService(CRMProviderInterface):
+CONTACT_SELECT_FIELDS = ["ID", "NAME", "LAST_NAME", "PHONE", "EMAIL"]
+
+
+def build_bitrix_query(params: Dict[str, Any]) -> str:
+    """Encode nested params the way PHP http_build_query does (fields[PHONE][0][VALUE]=...)"""
+    pairs: List[Tuple[str, str]] = []
+    
+    def flatten(value: Any, prefix: str) -> None:
+        if isinstance(value, dict):
+            for key, item in value.items():
+                flatten(item, f"{prefix}[{key}]")
+        elif isinstance(value, (list, tuple)):
+            for index, item in enumerate(value):
+                flatten(item, f"{prefix}[{index}]")
+        elif value is None:
+            pairs.append((prefix, ""))
+        else:
+            pairs.append((prefix, str(value)))
+    
+    for key, value in params.items():
+        flatten(value, str(key))
+    
+    return urlencode(pairs)
+
+
+def is_not_found_error(error: Any) -> bool:
+    """Bitrix24 answers crm.*.get for a missing ID with error_description "Not found"
+
+    error is a batch error item or the exception a single request raised.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        try:
+            error = error.response.json()
+        except ValueError:
+            return False
+    return isinstance(error, dict) and error.get("error_description") == "Not found"
+
+
+class BitrixService(BatchCRMProviderInterface):
     """Bitrix24 CRM provider implementation"""
     
-    def __init__(self, webhook_url: str = None):
+    def __init__(
+        self,
+        webhook_url: str = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        resilience: Optional[ResiliencePolicy] = None
+    ):
         self.webhook_url = webhook_url or settings.bitrix_webhook_url
+        # Shared pooled client; when missing a client is opened per request
+        self.http_client = http_client
+        # Shared per-portal limiter; Bitrix24 webhooks allow ~2 requests/s
+        self.rate_limiter = rate_limiter
+        # Shared circuit breaker and retry budget; only read methods are retried
+        self.resilience = resilience
+    
+    @staticmethod
+    def _is_idempotent(method: str) -> bool:
+        """Read-only Bitrix24 methods (crm.contact.get, crm.contact.list, ...)"""
+        return method.endswith((".get", ".list"))
     
     async def _make_request(self, method: str, data: Dict[str, Any] = None) -> Dict[str, Any]:
         """Make HTTP request to Bitrix24 API"""
+        if self.resilience is not None:
+            return await self.resilience.call(
+                lambda: self._request(method, data),
+                idempotent=self._is_idempotent(method)
+            )
+        return await self._request(method, data)
+    
+    async def _request(self, method: str, data: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Send request, waiting out Bitrix24 query limits"""
         url = f"{self.webhook_url}{method}"
+        retries = settings.bitrix_query_limit_retries
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=data or {})
+        for attempt in range(retries + 1):
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(timeout=settings.bitrix_rate_limit_max_wait)
+            
+            response = await self._post(url, data or {})
+            
+            if attempt < retries and self._is_query_limit_exceeded(response):
+                logger.warning(f"Bitrix24 query limit exceeded on {method}, retry {attempt + 1}/{retries}")
+                if self.rate_limiter is not None:
+                    # Our bucket was more optimistic than the portal: start refilling from zero
+                    self.rate_limiter.drain()
+                else:
+                    await asyncio.sleep(2 ** attempt)
+                continue
+            
             response.raise_for_status()
             return response.json()
     
+    async def _post(self, url: str, data: Dict[str, Any]) -> httpx.Response:
+        """Send POST request with shared or one-off client"""
+        if self.http_client is not None:
+            return await self.http_client.post(url, json=data)
+        
+        async with httpx.AsyncClient() as client:
+            return await client.post(url, json=data)
+    
+    @staticmethod
+    def _is_query_limit_exceeded(response: httpx.Response) -> bool:
+        """Check for Bitrix24 503 QUERY_LIMIT_EXCEEDED"""
+        if response.status_code != 503:
+            return False
+        try:
+            return response.json().get("error") == "QUERY_LIMIT_EXCEEDED"
+        except ValueError:
+            return False
+    
     async def create_contact(self, contact_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create contact in Bitrix24"""
         try:
@@ -57,7 +160,7 @@ class BitrixService(CRMProviderInterface):
         try:
             result = await self._make_request("crm.contact.list", {
                 "filter": {"PHONE": phone},
-                "select": ["ID", "NAME", "LAST_NAME", "PHONE", "EMAIL"]
+                "select": CONTACT_SELECT_FIELDS
             })
             
             contacts = result.get("result", [])
@@ -85,6 +188,66 @@ class BitrixService(CRMProviderInterface):
             logger.error(f"Failed to update contact in Bitrix24: {str(e)}")
             raise
 
+    
+    async def batch(self, commands: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Run (method, params) commands through Bitrix24 batch, 50 per request"""
+        results: List[Dict[str, Any]] = []
+        
+        for start in range(0, len(commands), BITRIX_BATCH_LIMIT):
+            chunk = commands[start:start + BITRIX_BATCH_LIMIT]
+            cmd = {
+                f"c{index}": f"{method}?{build_bitrix_query(params)}"
+                for index, (method, params) in enumerate(chunk)
+            }
+            response = await self._make_request("batch", {"halt": 0, "cmd": cmd})
+            
+            # Bitrix24 returns [] instead of {} for empty result maps
+            batch_result = response.get("result") or {}
+            succeeded = batch_result.get("result") or {}
+            failed = batch_result.get("result_error") or {}
+            
+            for key in cmd:
+                if key in failed:
+                    results.append({"error": failed[key]})
+                elif key in succeeded:
+                    results.append({"result": succeeded[key]})
+                else:
+                    results.append({"error": {"error": "NO_RESULT", "error_description": "Command skipped by batch"}})
+        
+        logger.info(f"Bitrix24 batch executed: {len(commands)} commands")
+        return results
+    
+    async def create_contacts(self, contacts_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create contacts in Bitrix24 via batch"""
+        return await self.batch([
+            ("crm.contact.add", {"fields": contact_data})
+            for contact_data in contacts_data
+        ])
+    
+    async def get_contacts(self, contact_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get contacts by IDs from Bitrix24 via batch"""
+        return await self.batch([
+            ("crm.contact.get", {"id": contact_id})
+            for contact_id in contact_ids
+        ])
+    
+    async def update_contacts(self, updates: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Update contacts in Bitrix24 via batch"""
+        return await self.batch([
+            ("crm.contact.update", {"id": contact_id, "fields": contact_data})
+            for contact_id, contact_data in updates
+        ])
+    
+    async def search_contacts_by_phone(self, phones: List[str]) -> List[Dict[str, Any]]:
+        """Search contacts by phone numbers in Bitrix24 via batch"""
+        results = await self.batch([
+            ("crm.contact.list", {"filter": {"PHONE": phone}, "select": CONTACT_SELECT_FIELDS})
+            for phone in phones
+        ])
+        return [
+            {"result": (item["result"] or [None])[0]} if "result" in item else item
+            for item in results
+        ]
 
 class CRMService:
     """Universal CRM service that works with any CRM provider"""
@@ -97,6 +260,22 @@ class CRMService:
         contact_data = self._build_contact_data(customer_data)
         return await self.crm_provider.create_contact(contact_data)
     
+    async def create_contacts_from_customers(self, customers_data: List[Any]) -> List[Dict[str, Any]]:
+        """Create CRM contacts for many customers, batched when the provider supports it"""
+        contacts_data = [self._build_contact_data(customer_data) for customer_data in customers_data]
+        
+        if isinstance(self.crm_provider, BatchCRMProviderInterface):
+            return await self.crm_provider.create_contacts(contacts_data)
+        
+        results = []
+        for contact_data in contacts_data:
+            try:
+                response = await self.crm_provider.create_contact(contact_data)
+                results.append({"result": response.get("result")})
+            except Exception as e:
+                results.append({"error": str(e)})
+        return results
+    
     async def validate_contact_id_by_phone(self, contact_id: str, phone: str) -> bool:
         """Validate that CRM contact ID matches phone number"""
         try:
@@ -106,6 +285,43 @@ class CRMService:
         except Exception:
             return False
     
+    async def validate_contact_ids_by_phone(self, pairs: List[Tuple[str, str]]) -> List[ContactCheck]:
+        """Check many (contact_id, phone) pairs
+        
+        A missing contact or one without the phone is MISMATCH. Any other
+        failed lookup is ERROR, so the caller can retry it instead of
+        replacing a contact that may well be valid.
+        """
+        contact_ids = [contact_id for contact_id, _ in pairs]
+        
+        if isinstance(self.crm_provider, BatchCRMProviderInterface):
+            results = await self.crm_provider.get_contacts(contact_ids)
+        else:
+            results = []
+            for contact_id in contact_ids:
+                try:
+                    results.append({"result": await self.crm_provider.get_contact(contact_id)})
+                except Exception as e:
+                    results.append({"error": e})
+        
+        checks = []
+        for (contact_id, phone), item in zip(pairs, results):
+            if "error" in item:
+                if is_not_found_error(item["error"]):
+                    checks.append(ContactCheck.MISMATCH)
+                else:
+                    logger.warning(f"Failed to check CRM contact {contact_id}: {item['error']}")
+                    checks.append(ContactCheck.ERROR)
+                continue
+            
+            contact = item.get("result")
+            # Single get_contact returns the whole API response, batch returns the contact itself
+            if isinstance(contact, dict) and "result" in contact and isinstance(contact["result"], dict):
+                contact = contact["result"]
+            phones = [p.get("VALUE") for p in (contact or {}).get("PHONE", [])] if isinstance(contact, dict) else []
+            checks.append(ContactCheck.VALID if phone in phones else ContactCheck.MISMATCH)
+        return checks
+    
     def _build_contact_data(self, customer_data) -> Dict[str, Any]:
         """Build CRM contact data from CustomerCreate - provider agnostic"""
         return {
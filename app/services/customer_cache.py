@@ -0,0 +1,54 @@
+from typing import Any, Dict, Optional, Tuple
+from app.config import settings
+from app.core.cache import TTLCache
+from app.schemas.customer import CustomerResponse
+
+# Marks a phone known to have no customer
+_MISSING = object()
+
+
+class CustomerCache:
+    """Process-wide cache of customers by phone, with short-lived negative entries
+
+    A miss is remembered for `negative_ttl` seconds so repeated lookups of an
+    unknown phone (e.g. while its checkout is still creating the customer)
+    do not each hit the database; creating the customer replaces the entry.
+    """
+
+    def __init__(self, max_size: int, ttl: float, negative_ttl: float):
+        self._cache = TTLCache(max_size=max_size, ttl=ttl)
+        self.negative_ttl = negative_ttl
+
+    def get(self, phone: str) -> Tuple[bool, Optional[CustomerResponse]]:
+        """Return (found, customer); found with None customer is a cached miss"""
+        value = self._cache.get(phone)
+        if value is None:
+            return False, None
+        if value is _MISSING:
+            return True, None
+        return True, value
+
+    def put(self, customer: CustomerResponse) -> None:
+        """Cache customer snapshot"""
+        self._cache.set(customer.phone, customer)
+
+    def put_missing(self, phone: str) -> None:
+        """Remember that phone has no customer"""
+        self._cache.set(phone, _MISSING, ttl=self.negative_ttl)
+
+    def invalidate(self, *phones: Optional[str]) -> None:
+        """Evict phones"""
+        for phone in phones:
+            if phone:
+                self._cache.pop(phone)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters"""
+        return self._cache.stats()
+
+
+customer_cache = CustomerCache(
+    max_size=settings.customer_cache_max_size,
+    ttl=settings.customer_cache_ttl_seconds,
+    negative_ttl=settings.customer_cache_negative_ttl_seconds
+)
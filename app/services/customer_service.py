@@ -1,59 +1,99 @@
-from typing import List, Optional
+from typing import Optional
 from app.repositories.customer_repository import CustomerRepository
 from app.schemas.customer import CustomerCreate, CustomerUpdate, CustomerResponse
+from app.schemas.pagination import Page
 from app.services.crm_service import CRMService
+from app.services.customer_cache import CustomerCache
+from app.repositories.unit_of_work import UnitOfWork
+from app.core.single_flight import SingleFlight
+from app.core.pagination import decode_cursor, split_page
 import logging
 
 logger = logging.getLogger(__name__)
 
+# In-process coalescing of concurrent get-or-create calls, keyed by phone
+customer_flights = SingleFlight()
+
+CRM_SYNC_OPERATION = "sync_contact"
+
 
 class CustomerService:
     """Customer service"""
     
-    def __init__(self, customer_repository: CustomerRepository, crm_service: CRMService = None):
+    def __init__(
+        self,
+        customer_repository: CustomerRepository,
+        crm_service: CRMService = None,
+        customer_cache: Optional[CustomerCache] = None
+    ):
         self.customer_repository = customer_repository
         self.crm_service = crm_service
+        self.customer_cache = customer_cache
+    
+    def _cache_customer(self, customer, committed: bool = True) -> CustomerResponse:
+        """Build response and cache it once the row is committed"""
+        response = CustomerResponse.model_validate(customer)
+        if self.customer_cache:
+            if committed:
+                self.customer_cache.put(response)
+            else:
+                # Row may still be rolled back by the unit of work; just drop the stale entry
+                self.customer_cache.invalidate(response.phone)
+        return response
     
     async def ensure_customer(self, customer_data: CustomerCreate) -> CustomerResponse:
         """Create customer with optional CRM integration or return existing customer"""
         try:
-            # Check if phone already exists
-            existing_customer = await self.customer_repository.get_by_phone(customer_data.phone)
-            if existing_customer:
-                logger.info(f"Customer with phone {customer_data.phone} already exists, returning existing")
+            # Repeat buyers are served from cache when no CRM work is pending
+            if self.customer_cache and not customer_data.bitrix_id:
+                _, cached = self.customer_cache.get(customer_data.phone)
+                if cached and (cached.bitrix_id or not self.crm_service):
+                    return cached
             
-            # Validate Bitrix ID if provided
-            if customer_data.bitrix_id and self.crm_service:
-                is_valid = await self.crm_service.validate_contact_id_by_phone(
-                    customer_data.bitrix_id, customer_data.phone
+            # Concurrent requests for the same phone share one upsert. Only
+            # committed results are shared: inside a unit of work the row
+            # is not visible to other sessions until that work commits.
+            if self.customer_repository.autocommit:
+                return await customer_flights.do(
+                    (customer_data.phone, customer_data.bitrix_id),
+                    lambda: self._ensure_customer(customer_data)
                 )
-                if not is_valid:
-                    raise ValueError(f"Bitrix ID {customer_data.bitrix_id} doesn't match phone {customer_data.phone}")
-            
-            # Create customer in database
-            if not existing_customer:
-                customer = await self.customer_repository.create(customer_data.dict())
-            else:
-                customer = existing_customer
-            
-            # Create CRM contact if no Bitrix ID provided
-            if not customer_data.bitrix_id and self.crm_service and not customer.bitrix_id:
-                try:
-                    crm_result = await self.crm_service.create_contact_from_customer(customer_data)
-                    if crm_result.get("result"):
-                        customer.bitrix_id = str(crm_result["result"])
-                        await self.customer_repository.update(customer)
-                        logger.info(f"CRM contact created for customer: {customer.phone}")
-                except Exception as crm_error:
-                    logger.warning(f"Failed to create CRM contact: {str(crm_error)}")
-            
-            logger.info(f"Customer created: {customer.phone}")
-            return CustomerResponse.model_validate(customer)
+            return await self._ensure_customer(customer_data)
             
         except Exception as e:
             logger.error(f"Failed to create customer: {str(e)}")
             raise
     
+    async def _ensure_customer(self, customer_data: CustomerCreate) -> CustomerResponse:
+        """Upsert customer by phone and queue its CRM sync in the same transaction"""
+        uow = UnitOfWork(self.customer_repository.session)
+        
+        # Create customer in database or get existing one, race-free
+        customer, created = await uow.customers.get_or_create_by_phone(customer_data.dict())
+        if not created:
+            logger.info(f"Customer with phone {customer_data.phone} already exists, returning existing")
+        
+        # CRM contact is created/validated by CRMOutboxWorker, off the request path
+        if self.crm_service and not (customer.bitrix_id and not created):
+            queued = await uow.crm_outbox.enqueue(customer.id, CRM_SYNC_OPERATION, {
+                "phone": customer.phone,
+                "first_name": customer.first_name,
+                "last_name": customer.last_name,
+                "email": customer.email,
+                "bitrix_id": customer.bitrix_id
+            })
+            if queued:
+                logger.info(f"CRM sync queued for customer: {customer.phone}")
+        
+        # Unless a unit of work owns this session, customer and outbox job commit together
+        if self.customer_repository.autocommit:
+            await uow.commit()
+        
+        logger.info(f"Customer created: {customer.phone}")
+        # Inside a unit of work only an existing row is known to be committed
+        committed = self.customer_repository.autocommit or not created
+        return self._cache_customer(customer, committed=committed)
+    
     async def get_customer(self, customer_id: int) -> Optional[CustomerResponse]:
         """Get customer by ID"""
         customer = await self.customer_repository.get_by_id(customer_id)
@@ -64,16 +104,27 @@ class CustomerService:
     
     async def get_customer_by_phone(self, phone: str) -> Optional[CustomerResponse]:
         """Get customer by phone"""
+        if self.customer_cache:
+            found, cached = self.customer_cache.get(phone)
+            if found:
+                return cached
+        
         customer = await self.customer_repository.get_by_phone(phone)
         if not customer:
+            if self.customer_cache:
+                self.customer_cache.put_missing(phone)
             return None
         
-        return CustomerResponse.model_validate(customer)
+        return self._cache_customer(customer)
     
-    async def get_all_customers(self) -> List[CustomerResponse]:
-        """Get all customers"""
-        customers = await self.customer_repository.get_all()
-        return [CustomerResponse.model_validate(customer) for customer in customers]
+    async def list_customers(self, limit: int, after: Optional[str] = None) -> Page[CustomerResponse]:
+        """Get a page of customers; after is the next_cursor of the previous page"""
+        customers = await self.customer_repository.get_page(limit, decode_cursor(after))
+        items, next_cursor = split_page(customers, limit)
+        return Page[CustomerResponse](
+            items=[CustomerResponse.model_validate(customer) for customer in items],
+            next_cursor=next_cursor
+        )
     
     async def update_customer(self, customer_id: int, customer_data: CustomerUpdate) -> Optional[CustomerResponse]:
         """Update customer"""
@@ -83,6 +134,7 @@ class CustomerService:
         
         try:
             update_data = customer_data.dict(exclude_unset=True)
+            previous_phone = customer.phone
             
             # Check phone uniqueness if changing
             if 'phone' in update_data and update_data['phone'] != customer.phone:
@@ -94,6 +146,8 @@ class CustomerService:
                 setattr(customer, key, value)
             
             updated_customer = await self.customer_repository.update(customer)
+            if self.customer_cache:
+                self.customer_cache.invalidate(previous_phone, updated_customer.phone)
             logger.info(f"Customer updated: {updated_customer.phone} (ID: {updated_customer.id})")
             return CustomerResponse.model_validate(updated_customer)
             
@@ -104,8 +158,13 @@ class CustomerService:
     async def delete_customer(self, customer_id: int) -> bool:
         """Delete customer"""
         try:
+            customer = await self.customer_repository.get_by_id(customer_id)
+            phone = customer.phone if customer else None
+            
             result = await self.customer_repository.delete(customer_id)
             if result:
+                if self.customer_cache:
+                    self.customer_cache.invalidate(phone)
                 logger.info(f"Customer deleted: {customer_id}")
             return result
             
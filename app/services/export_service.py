@@ -0,0 +1,125 @@
+import csv
+import io
+import json
+from contextlib import aclosing
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Optional, Sequence
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.types.export_types import ExportFormat
+from app.repositories.payment_item_repository import PaymentItemRepository
+from app.repositories.payment_repository import PaymentRepository
+import logging
+
+logger = logging.getLogger(__name__)
+
+PAYMENT_EXPORT_COLUMNS = [
+    "id", "external_id", "store_order_id", "customer_id", "total_sum", "status", "created_at", "updated_at"
+]
+
+PAYMENT_ITEM_EXPORT_COLUMNS = [
+    "id", "payment_id", "product_id", "customer_id", "quantity", "unit_price", "total_price",
+    "created_at", "updated_at"
+]
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Timestamps are stored as naive UTC"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _export_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _ndjson_chunk(batch: Sequence[RowMapping]) -> str:
+    return "".join(
+        json.dumps({key: _export_value(value) for key, value in row.items()}, ensure_ascii=False) + "\n"
+        for row in batch
+    )
+
+
+def _csv_chunk(rows: Sequence[Sequence[Any]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+class ExportService:
+    """Streams payments and payment items as NDJSON or CSV
+
+    Each export reads through a server-side cursor in its own session and
+    emits one chunk per batch of `batch_size` rows, so memory doesn't grow
+    with the size of the export. Closing the returned iterator (e.g. when
+    the client disconnects) closes the cursor and stops the query.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession], batch_size: int = 1000):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+
+    def export_payments(
+        self,
+        export_format: ExportFormat,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> AsyncIterator[str]:
+        """Payments created in [created_from, created_to)"""
+        return self._export(PaymentRepository, PAYMENT_EXPORT_COLUMNS, export_format, created_from, created_to)
+
+    def export_payment_items(
+        self,
+        export_format: ExportFormat,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> AsyncIterator[str]:
+        """Payment items created in [created_from, created_to)"""
+        return self._export(
+            PaymentItemRepository, PAYMENT_ITEM_EXPORT_COLUMNS, export_format, created_from, created_to
+        )
+
+    def _export(
+        self,
+        repository_class: type,
+        columns: Sequence[str],
+        export_format: ExportFormat,
+        created_from: Optional[datetime],
+        created_to: Optional[datetime]
+    ) -> AsyncIterator[str]:
+        created_from, created_to = _naive_utc(created_from), _naive_utc(created_to)
+        # Validated here, before the response starts, so errors still get a status code
+        if created_from is not None and created_to is not None and created_from >= created_to:
+            raise ValueError("created_from must be earlier than created_to")
+        return self._stream(repository_class, columns, export_format, created_from, created_to)
+
+    async def _stream(
+        self,
+        repository_class: type,
+        columns: Sequence[str],
+        export_format: ExportFormat,
+        created_from: Optional[datetime],
+        created_to: Optional[datetime]
+    ) -> AsyncIterator[str]:
+        if export_format == ExportFormat.CSV:
+            yield _csv_chunk([columns])
+
+        exported = 0
+        try:
+            async with self.session_factory() as session:
+                async with aclosing(repository_class(session).stream_for_export(
+                    columns, created_from, created_to, self.batch_size
+                )) as batches:
+                    async for batch in batches:
+                        if export_format == ExportFormat.CSV:
+                            yield _csv_chunk([[_export_value(row[column]) for column in columns] for row in batch])
+                        else:
+                            yield _ndjson_chunk(batch)
+                        exported += len(batch)
+        except Exception as e:
+            # Headers are already sent; the client sees a truncated response
+            logger.error(f"Export of {repository_class.__name__} failed after {exported} rows: {str(e)}")
+            raise
+
+        logger.info(f"Exported {exported} rows via {repository_class.__name__}")
@@ -0,0 +1,100 @@
+import hashlib
+from typing import Awaitable, Callable, Optional, Tuple
+from app.config import settings
+from app.core.cache import TTLCache
+from app.core.single_flight import SingleFlight
+from app.repositories.idempotency_repository import IdempotencyRepository
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Concurrent duplicates in this process wait for the first request's response
+idempotency_flights = SingleFlight()
+
+# Recent responses by key: (request_hash, response JSON)
+idempotency_cache = TTLCache(
+    max_size=settings.idempotency_cache_max_size,
+    ttl=settings.idempotency_cache_ttl_seconds
+)
+
+
+class IdempotencyConflict(Exception):
+    """Key was already used with a different request body"""
+    pass
+
+
+class IdempotencyInProgress(Exception):
+    """Another process is still handling a request with this key"""
+    pass
+
+
+def request_hash(body: str) -> str:
+    """Fingerprint of a request body"""
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class IdempotencyService:
+    """Runs a request at most once per idempotency key and replays its stored response
+
+    Replays are served from the in-process cache or the idempotency_records
+    table. Duplicates arriving while the first request runs are coalesced
+    onto it in this process, and get IdempotencyInProgress from other
+    processes. Failed requests don't store anything, so they can be retried.
+
+    fn stores its own response with IdempotencyRepository.complete in the
+    transaction that commits its effects (UnitOfWork.idempotency), so a
+    committed result is never left without its stored response.
+    """
+
+    def __init__(
+        self,
+        idempotency_repository: IdempotencyRepository,
+        cache: Optional[TTLCache] = None,
+        lease_seconds: float = 60.0
+    ):
+        self.idempotency_repository = idempotency_repository
+        self.cache = cache
+        self.lease_seconds = lease_seconds
+
+    def _replay(self, key: str, body_hash: str, stored: Tuple[str, str]) -> str:
+        stored_hash, response = stored
+        if stored_hash != body_hash:
+            raise IdempotencyConflict(f"Idempotency key {key} was used with a different request")
+        logger.info(f"Replaying stored response for idempotency key {key}")
+        return response
+
+    async def run(self, key: str, body_hash: str, fn: Callable[[], Awaitable[str]]) -> str:
+        """Return fn()'s JSON response, running fn only for the first request with key
+
+        fn must complete the key in its own transaction before committing.
+        """
+        if self.cache is not None:
+            stored = self.cache.get(key)
+            if stored is not None:
+                return self._replay(key, body_hash, stored)
+
+        return await idempotency_flights.do((key, body_hash), lambda: self._run(key, body_hash, fn))
+
+    async def _run(self, key: str, body_hash: str, fn: Callable[[], Awaitable[str]]) -> str:
+        record, claimed = await self.idempotency_repository.claim(key, body_hash, self.lease_seconds)
+        if not claimed:
+            if record.status != "completed":
+                raise IdempotencyInProgress(f"Request with idempotency key {key} is still in progress")
+            stored = (record.request_hash, record.response)
+            if self.cache is not None:
+                self.cache.set(key, stored)
+            return self._replay(key, body_hash, stored)
+
+        try:
+            response = await fn()
+        except Exception:
+            # A cancelled request keeps its claim until the lease expires
+            try:
+                await self.idempotency_repository.release(key)
+            except Exception as e:
+                logger.error(f"Failed to release idempotency key {key}: {str(e)}")
+            raise
+
+        if self.cache is not None:
+            self.cache.set(key, (body_hash, response))
+        return response
@@ -3,9 +3,10 @@ import hmac
 import base64
 import json
 import httpx
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
 from app.core.interfaces.payment_provider import PaymentProviderInterface
+from app.core.resilience import ResiliencePolicy
 
 logger = logging.getLogger(__name__)
 
@@ -13,10 +14,21 @@ logger = logging.getLogger(__name__)
 class MonobankService(PaymentProviderInterface):
     """Service for Monobank API integration"""
     
-    def __init__(self, store_id: str, store_secret: str, base_url: str = "https://u2-demo-ext.mono.st4g3.com"):
+    def __init__(
+        self,
+        store_id: str,
+        store_secret: str,
+        base_url: str = "https://u2-demo-ext.mono.st4g3.com",
+        http_client: Optional[httpx.AsyncClient] = None,
+        resilience: Optional[ResiliencePolicy] = None
+    ):
         self.store_id = store_id
         self.store_secret = store_secret
         self.base_url = base_url.rstrip('/')
+        # Shared pooled client; when missing a client is opened per request
+        self.http_client = http_client
+        # Shared circuit breaker and retry budget; only GET requests are retried
+        self.resilience = resilience
     
     def _generate_signature(self, request_body: str) -> str:
         """Generate HMAC-SHA256 signature"""
@@ -44,14 +56,33 @@ class MonobankService(PaymentProviderInterface):
             'Accept': 'application/json'
         }
         
-        async with httpx.AsyncClient() as client:
-            if method.upper() == "GET":
-                response = await client.get(url, headers=headers)
-            else:
-                response = await client.post(url, data=request_body, headers=headers)
+        async def send() -> Dict[str, Any]:
+            if self.http_client is not None:
+                return await self._send(self.http_client, method, url, request_body, headers)
             
-            response.raise_for_status()
-            return response.json()
+            async with httpx.AsyncClient() as client:
+                return await self._send(client, method, url, request_body, headers)
+        
+        if self.resilience is not None:
+            return await self.resilience.call(send, idempotent=method.upper() == "GET")
+        return await send()
+    
+    async def _send(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        url: str,
+        request_body: str,
+        headers: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """Send request with given client"""
+        if method.upper() == "GET":
+            response = await client.get(url, headers=headers)
+        else:
+            response = await client.post(url, content=request_body, headers=headers)
+        
+        response.raise_for_status()
+        return response.json()
     
     async def create_order(self, order_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create payment order"""
@@ -0,0 +1,15 @@
+from typing import Optional
+from app.core.pubsub import PubSub
+from app.services.payment_status_cache import payment_status_cache
+
+# Status changes by Monobank order ID; feeds SSE and long-poll waiters
+payment_events = PubSub()
+
+
+def publish_status_change(external_id: Optional[str], status: Optional[str]) -> None:
+    """Evict cached status and wake waiters of this payment"""
+    if not external_id:
+        return
+    payment_status_cache.invalidate(external_id)
+    if status:
+        payment_events.publish(external_id, status)
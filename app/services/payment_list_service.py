@@ -0,0 +1,21 @@
+from typing import Optional
+from app.core.pagination import decode_cursor, split_page
+from app.repositories.payment_repository import PaymentRepository
+from app.schemas.pagination import Page
+from app.schemas.payment import PaymentSummary
+
+
+class PaymentListService:
+    """Pages through local payments in (created_at, id) order, oldest first"""
+
+    def __init__(self, payment_repository: PaymentRepository):
+        self.payment_repository = payment_repository
+
+    async def list_payments(self, limit: int, after: Optional[str] = None) -> Page[PaymentSummary]:
+        """Get a page of payments; after is the next_cursor of the previous page"""
+        payments = await self.payment_repository.get_page(limit, decode_cursor(after))
+        items, next_cursor = split_page(payments, limit)
+        return Page[PaymentSummary](
+            items=[PaymentSummary.model_validate(payment) for payment in items],
+            next_cursor=next_cursor
+        )
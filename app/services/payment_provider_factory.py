@@ -1,7 +1,11 @@
 from typing import Dict, Any
 from app.core.interfaces.payment_provider import PaymentProviderInterface
 from app.core.types.payment_types import PaymentProviderType
+from app.config import settings
 from app.services.monobank_service import MonobankService
+from app.services.payment_service import PaymentService
+from app.core.http_client import http_clients
+from app.core.resilience import resilience_policies
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,7 +23,9 @@ class PaymentProviderFactory:
             return MonobankService(
                 store_id=kwargs.get("store_id"),
                 store_secret=kwargs.get("store_secret"),
-                base_url=kwargs.get("base_url", "https://u2-demo-ext.mono.st4g3.com")
+                base_url=kwargs.get("base_url", "https://u2-demo-ext.mono.st4g3.com"),
+                http_client=kwargs.get("http_client") or http_clients.get(PaymentProviderType.MONOBANK),
+                resilience=kwargs.get("resilience") or resilience_policies.get(PaymentProviderType.MONOBANK)
             )
         elif provider_type == PaymentProviderType.PRIVATBANK:
             # Future implementation for Privatbank
@@ -31,3 +37,14 @@ class PaymentProviderFactory:
     def get_available_providers() -> list[str]:
         """Get list of available payment providers"""
         return [PaymentProviderType.MONOBANK]
+
+
+def create_payment_service() -> PaymentService:
+    """PaymentService with the configured Monobank provider"""
+    provider = PaymentProviderFactory.create_provider(
+        provider_type=PaymentProviderType.MONOBANK,
+        store_id=settings.monobank_store_id,
+        store_secret=settings.monobank_store_secret,
+        base_url=settings.monobank_base_url
+    )
+    return PaymentService(provider)
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Tuple
+from sqlalchemy import func, select
+from app.config import settings
+from app.core.rate_limiter import TokenBucket
+from app.core.types.payment_types import PaymentState
+from app.database import async_session, engine
+from app.repositories.payment_repository import PaymentRepository
+from app.services.background_worker import BackgroundWorkerPool
+from app.services.payment_events import publish_status_change
+from app.services.payment_provider_factory import create_payment_service
+from app.services.payment_service import PaymentService
+from app.services.payment_state_machine import PaymentStateMachine, TERMINAL_STATES, map_monobank_state
+
+logger = logging.getLogger(__name__)
+
+# pg advisory lock key held by the leading reconciler ("mono_rec")
+RECONCILER_LOCK_KEY = 0x6D6F6E6F5F726563
+
+NON_TERMINAL_STATES = [state.value for state in PaymentState if state not in TERMINAL_STATES]
+
+
+class PaymentReconciler(BackgroundWorkerPool):
+    """Re-checks payments stuck in a non-final status whose callback was lost
+
+    Every `interval` seconds one process (holder of a Postgres advisory lock)
+    walks non-final payments older than `min_age` with a keyset scan on
+    (created_at, id), asks Monobank for their status with at most
+    `concurrency` calls in flight and `rate` calls per second, and applies
+    each page of results through the state machine in batched UPDATEs.
+    A run stops after `max_per_run` payments and the next one resumes from
+    the same keyset position, so a large backlog is covered in rounds.
+    """
+
+    name = "payment-reconciler"
+
+    def __init__(
+        self,
+        interval: float,
+        min_age: timedelta,
+        page_size: int,
+        concurrency: int,
+        rate: float,
+        max_per_run: int,
+        payment_service_factory: Callable[[], PaymentService] = create_payment_service
+    ):
+        super().__init__(concurrency=1, poll_interval=interval)
+        self.min_age = min_age
+        self.page_size = page_size
+        self.max_calls = concurrency
+        self.rate = rate
+        self.max_per_run = max_per_run
+        self.payment_service_factory = payment_service_factory
+        self._after: Optional[Tuple[datetime, int]] = None
+
+    async def run_once(self) -> int:
+        # Session-level lock on a dedicated autocommit connection: released on
+        # unlock or when the connection drops, never held by an open transaction
+        async with engine.connect() as connection:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            leader = await connection.scalar(select(func.pg_try_advisory_lock(RECONCILER_LOCK_KEY)))
+            if not leader:
+                return 0
+            try:
+                await self._reconcile()
+            finally:
+                await connection.scalar(select(func.pg_advisory_unlock(RECONCILER_LOCK_KEY)))
+
+        # Always wait for the next interval, even after a busy run
+        return 0
+
+    async def _reconcile(self) -> None:
+        payment_service = self.payment_service_factory()
+        semaphore = asyncio.Semaphore(self.max_calls)
+        budget = TokenBucket(rate=self.rate, capacity=max(1, int(self.rate)))
+        created_before = datetime.utcnow() - self.min_age
+        checked = 0
+        changed: Dict[str, str] = {}
+
+        while checked < self.max_per_run:
+            async with async_session() as session:
+                payments = await PaymentRepository(session).get_page_by_status(
+                    NON_TERMINAL_STATES,
+                    created_before,
+                    after=self._after,
+                    limit=min(self.page_size, self.max_per_run - checked)
+                )
+            if not payments:
+                self._after = None  # scan finished, next run starts over
+                break
+
+            self._after = (payments[-1].created_at, payments[-1].id)
+            checked += len(payments)
+
+            external_ids = [payment.external_id for payment in payments]
+            results = await asyncio.gather(*(
+                self._fetch_status(payment_service, semaphore, budget, external_id)
+                for external_id in external_ids
+            ))
+            statuses = {
+                external_id: status
+                for external_id, status in zip(external_ids, results)
+                if status is not None
+            }
+            if not statuses:
+                continue
+
+            async with async_session() as session:
+                applied = await PaymentStateMachine(PaymentRepository(session)).apply_many(statuses)
+            for external_id, status in applied.items():
+                publish_status_change(external_id, status)
+            changed.update(applied)
+
+        if checked:
+            logger.info(f"Reconciler checked {checked} payments, updated {len(changed)}")
+
+    async def _fetch_status(
+        self,
+        payment_service: PaymentService,
+        semaphore: asyncio.Semaphore,
+        budget: TokenBucket,
+        external_id: str
+    ) -> Optional[PaymentState]:
+        """Monobank status mapped to a local one; None if unknown or the call failed"""
+        async with semaphore:
+            await budget.acquire()
+            try:
+                result = await payment_service.get_payment_status(external_id)
+            except Exception as e:
+                logger.warning(f"Reconciler could not check payment {external_id}: {str(e)}")
+                return None
+        return map_monobank_state(result.get("state") or result.get("status"))
+
+
+payment_reconciler = PaymentReconciler(
+    interval=settings.payment_reconciler_interval_seconds,
+    min_age=timedelta(minutes=settings.payment_reconciler_min_age_minutes),
+    page_size=settings.payment_reconciler_page_size,
+    concurrency=settings.payment_reconciler_concurrency,
+    rate=settings.payment_reconciler_rate_per_second,
+    max_per_run=settings.payment_reconciler_max_per_run
+)
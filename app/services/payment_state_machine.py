@@ -0,0 +1,115 @@
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional
+from app.core.types.payment_types import PaymentState
+from app.repositories.payment_repository import PaymentRepository
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Allowed transitions: target status -> statuses it may be reached from.
+# Terminal statuses have no outgoing edges, so late or repeated callbacks
+# cannot move a finished payment back.
+TRANSITIONS: Dict[PaymentState, FrozenSet[PaymentState]] = {
+    PaymentState.IN_PROCESS: frozenset({PaymentState.PENDING}),
+    PaymentState.SUCCESS: frozenset({PaymentState.PENDING, PaymentState.IN_PROCESS}),
+    PaymentState.FAIL: frozenset({PaymentState.PENDING, PaymentState.IN_PROCESS}),
+}
+
+TERMINAL_STATES: FrozenSet[PaymentState] = frozenset({PaymentState.SUCCESS, PaymentState.FAIL})
+
+# Monobank callback/status values -> local statuses
+MONOBANK_STATES: Dict[str, PaymentState] = {
+    "IN_PROCESS": PaymentState.IN_PROCESS,
+    "SUCCESS": PaymentState.SUCCESS,
+    "FAIL": PaymentState.FAIL,
+}
+
+
+def map_monobank_state(state: Optional[str]) -> Optional[PaymentState]:
+    """Map Monobank status to local status, None if unknown"""
+    if not state:
+        return None
+    return MONOBANK_STATES.get(state.upper())
+
+
+def is_terminal(status: Optional[str]) -> bool:
+    """Whether a stored status can no longer change"""
+    return status in {state.value for state in TERMINAL_STATES}
+
+
+@dataclass
+class TransitionResult:
+    """Outcome of applying a status to a payment"""
+    external_id: str
+    status: Optional[str]  # status stored after the call
+    outcome: str  # applied, duplicate, stale, not_found
+
+    @property
+    def applied(self) -> bool:
+        return self.outcome == "applied"
+
+
+class PaymentStateMachine:
+    """Applies provider statuses to local Payment rows through TRANSITIONS"""
+
+    def __init__(self, payment_repository: PaymentRepository):
+        self.payment_repository = payment_repository
+
+    async def apply(self, external_id: str, new_status: PaymentState) -> TransitionResult:
+        """Move payment to new_status if allowed
+
+        Repeated callbacks (already in new_status) are reported as duplicate,
+        out-of-order ones (status can't be reached from the current one) as
+        stale; neither changes the row.
+        """
+        try:
+            applied = await self.payment_repository.transition_status(
+                external_id,
+                new_status.value,
+                [state.value for state in TRANSITIONS.get(new_status, ())]
+            )
+            if applied:
+                logger.info(f"Payment {external_id} -> {new_status.value}")
+                return TransitionResult(external_id, new_status.value, "applied")
+
+            current = await self.payment_repository.get_status_by_external_id(external_id)
+            if current is None:
+                outcome = "not_found"
+            elif current == new_status.value:
+                outcome = "duplicate"
+            else:
+                outcome = "stale"
+                logger.info(
+                    f"Ignored transition {current} -> {new_status.value} for payment {external_id}"
+                )
+            return TransitionResult(external_id, current, outcome)
+
+        except Exception as e:
+            logger.error(f"Failed to apply status {new_status.value} to payment {external_id}: {str(e)}")
+            raise
+
+    async def apply_many(self, statuses: Dict[str, PaymentState]) -> Dict[str, str]:
+        """Apply statuses to many payments (external_id -> status), one UPDATE per target status
+
+        Returns external_id -> new status for payments that actually changed;
+        duplicates and disallowed transitions are skipped like in apply().
+        """
+        by_status: Dict[PaymentState, List[str]] = {}
+        for external_id, new_status in statuses.items():
+            by_status.setdefault(new_status, []).append(external_id)
+
+        changed: Dict[str, str] = {}
+        try:
+            for new_status, external_ids in by_status.items():
+                applied = await self.payment_repository.transition_status_many(
+                    external_ids,
+                    new_status.value,
+                    [state.value for state in TRANSITIONS.get(new_status, ())]
+                )
+                changed.update((external_id, new_status.value) for external_id in applied)
+            return changed
+
+        except Exception as e:
+            logger.error(f"Failed to apply statuses to {len(statuses)} payments: {str(e)}")
+            raise
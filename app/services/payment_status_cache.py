@@ -0,0 +1,52 @@
+from typing import Any, Dict, Optional
+from app.config import settings
+from app.core.cache import TTLCache
+from app.schemas.payment import PaymentStatus
+
+
+class PaymentStatusCache:
+    """Process-wide cache of payment statuses by external ID or local payment ID
+
+    Terminal statuses never change, so they live for `ttl` seconds; pending
+    ones expire after `refresh_after` seconds, which bounds how stale a
+    polled status can get before the row (and maybe Monobank) is re-checked.
+
+    Statuses are stored under the external ID; ("id", payment_id) keys only
+    point to it, so invalidating the external ID covers both lookups.
+    """
+
+    def __init__(self, max_size: int, ttl: float, refresh_after: float):
+        self._cache = TTLCache(max_size=max_size, ttl=ttl)
+        self.refresh_after = refresh_after
+
+    def get(self, payment_ref: str) -> Optional[PaymentStatus]:
+        """Cached status by external ID (or local payment ID), or None"""
+        key = payment_ref
+        # Same precedence as the DB lookup: external ID first
+        if payment_ref.isdigit() and self._cache.get(payment_ref, record_stats=False) is None:
+            key = self._cache.get(("id", int(payment_ref)), record_stats=False) or payment_ref
+        return self._cache.get(key)
+
+    def put(self, status: PaymentStatus, terminal: bool) -> None:
+        """Cache status snapshot"""
+        if status.external_id:
+            ttl = None if terminal else self.refresh_after
+            self._cache.set(status.external_id, status, ttl=ttl)
+            self._cache.set(("id", status.payment_id), status.external_id, ttl=ttl)
+
+    def invalidate(self, *external_ids: Optional[str]) -> None:
+        """Evict payments"""
+        for external_id in external_ids:
+            if external_id:
+                self._cache.pop(external_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters"""
+        return self._cache.stats()
+
+
+payment_status_cache = PaymentStatusCache(
+    max_size=settings.payment_status_cache_max_size,
+    ttl=settings.payment_status_cache_ttl_seconds,
+    refresh_after=settings.payment_status_refresh_seconds
+)
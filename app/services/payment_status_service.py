@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from app.core.single_flight import SingleFlight
+from app.core.types.payment_types import PaymentState
+from app.models.payment import Payment
+from app.repositories.payment_repository import PaymentRepository
+from app.schemas.payment import PaymentStatus
+from app.services.payment_service import PaymentService
+from app.services.payment_events import publish_status_change
+from app.services.payment_state_machine import PaymentStateMachine, is_terminal, map_monobank_state
+from app.services.payment_status_cache import PaymentStatusCache
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Coalesces concurrent polls of the same payment in this process
+status_flights = SingleFlight()
+
+
+class PaymentStatusService:
+    """Answers payment status from the local row, asking Monobank only when it may be stale
+
+    Terminal statuses are served from the row/cache without upstream calls.
+    A pending payment is re-checked in Monobank only when its row hasn't
+    changed for `refresh_after` seconds (webhooks normally keep it current);
+    the fetched status goes through the state machine like a callback.
+    """
+
+    def __init__(
+        self,
+        payment_repository: PaymentRepository,
+        payment_service: PaymentService,
+        status_cache: Optional[PaymentStatusCache] = None,
+        refresh_after: float = 15.0
+    ):
+        self.payment_repository = payment_repository
+        self.payment_service = payment_service
+        self.status_cache = status_cache
+        self.refresh_after = refresh_after
+        self.state_machine = PaymentStateMachine(payment_repository)
+
+    async def get_status(self, payment_ref: str) -> PaymentStatus:
+        """Get status by Monobank order ID (or local payment ID)"""
+        if self.status_cache is not None:
+            cached = self.status_cache.get(payment_ref)
+            if cached is not None:
+                return cached
+
+        return await status_flights.do(payment_ref, lambda: self._load_status(payment_ref))
+
+    async def _find_payment(self, payment_ref: str) -> Optional[Payment]:
+        payment = await self.payment_repository.get_by_external_id(payment_ref)
+        if payment is None and payment_ref.isdigit():
+            payment = await self.payment_repository.get_by_id(int(payment_ref))
+        return payment
+
+    async def _load_status(self, payment_ref: str) -> PaymentStatus:
+        try:
+            payment = await self._find_payment(payment_ref)
+            if not payment:
+                raise ValueError(f"Payment {payment_ref} not found")
+
+            status = payment.status
+            if not is_terminal(status) and payment.external_id and self._is_stale(payment):
+                status = await self._refresh_from_provider(payment.external_id, status)
+
+            result = PaymentStatus(
+                payment_id=payment.id,
+                external_id=payment.external_id,
+                status=status,
+                is_confirmed=status == PaymentState.SUCCESS.value,
+                total_sum=payment.total_sum
+            )
+            if self.status_cache is not None:
+                self.status_cache.put(result, terminal=is_terminal(status))
+            return result
+
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to get payment status: {str(e)}")
+            raise
+
+    def _is_stale(self, payment: Payment) -> bool:
+        changed_at = payment.updated_at or payment.created_at
+        return changed_at is None or datetime.utcnow() - changed_at >= timedelta(seconds=self.refresh_after)
+
+    async def _refresh_from_provider(self, external_id: str, current: str) -> str:
+        """Fetch status from Monobank and apply it; keep the local one if that fails"""
+        try:
+            provider_status = await self.payment_service.get_payment_status(external_id)
+        except Exception as e:
+            logger.warning(f"Serving local status for {external_id}, Monobank check failed: {str(e)}")
+            return current
+
+        new_status = map_monobank_state(provider_status.get("state") or provider_status.get("status"))
+        if new_status is None:
+            return current
+
+        result = await self.state_machine.apply(external_id, new_status)
+        if result.applied:
+            publish_status_change(external_id, result.status)
+        return result.status or current
@@ -0,0 +1,85 @@
+import time
+from typing import AsyncIterator, Awaitable, Callable, Optional
+from app.core.pubsub import PubSub
+from app.core.types.payment_types import PaymentState
+from app.schemas.payment import PaymentStatus
+from app.services.payment_state_machine import is_terminal
+
+
+class PaymentStatusStream:
+    """Waits for payment status changes published by the webhook worker
+
+    Waiters hold no DB session: `load_status` opens a short one per check.
+    Events only reach waiters in the process that applied the change, so
+    every `recheck_interval` seconds the status is also re-read (mostly
+    from the status cache) to pick up changes made by other workers.
+    """
+
+    def __init__(
+        self,
+        load_status: Callable[[str], Awaitable[PaymentStatus]],
+        events: PubSub,
+        recheck_interval: float
+    ):
+        self.load_status = load_status
+        self.events = events
+        self.recheck_interval = recheck_interval
+
+    @staticmethod
+    def _with_status(current: PaymentStatus, status: str) -> PaymentStatus:
+        return current.model_copy(update={
+            "status": status,
+            "is_confirmed": status == PaymentState.SUCCESS.value
+        })
+
+    async def _next_change(self, current: PaymentStatus, subscription, timeout: float) -> Optional[PaymentStatus]:
+        """Status once it differs from current, or None after timeout"""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+
+            status = await subscription.get(min(remaining, self.recheck_interval))
+            if status is not None:
+                latest = self._with_status(current, status)
+            else:
+                latest = await self.load_status(current.external_id or str(current.payment_id))
+
+            if latest.status != current.status:
+                return latest
+
+    async def wait(self, payment_ref: str, timeout: float) -> PaymentStatus:
+        """Long-poll: return when the status changes, is terminal, or after timeout"""
+        current = await self.load_status(payment_ref)
+        if timeout <= 0 or is_terminal(current.status) or not current.external_id:
+            return current
+
+        with self.events.subscribe(current.external_id) as subscription:
+            changed = await self._next_change(current, subscription, timeout)
+        return changed or current
+
+    async def stream(
+        self,
+        payment_ref: str,
+        heartbeat: float,
+        max_duration: float
+    ) -> AsyncIterator[Optional[PaymentStatus]]:
+        """Yield current status, then every change; None is a heartbeat. Ends on terminal status"""
+        current = await self.load_status(payment_ref)
+        yield current
+        if is_terminal(current.status) or not current.external_id:
+            return
+
+        deadline = time.monotonic() + max_duration
+        with self.events.subscribe(current.external_id) as subscription:
+            while time.monotonic() < deadline:
+                changed = await self._next_change(current, subscription, heartbeat)
+                if changed is None:
+                    yield None
+                    continue
+
+                current = changed
+                yield current
+                if is_terminal(current.status):
+                    return
@@ -1,9 +1,18 @@
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from app.repositories.product_repository import ProductRepository
+from app.services.catalog_cache import CatalogCache
+from app.services.catalog_listener import build_invalidation_payloads
 from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
-from app.schemas.payment import ProductItemRequest, ProductItemResponse, PaymentCalculationResponse
+from app.schemas.pagination import Page
+from app.schemas.payment import (
+    ProductItemRequest, ProductItemResponse, PaymentCalculationResponse,
+    BatchCalculationRequest, BatchCalculationResponse, CartCalculationResult
+)
+from app.utils.security import sign_token, verify_token
+from app.core.pagination import decode_cursor, split_page
 from datetime import datetime
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -11,8 +20,49 @@ logger = logging.getLogger(__name__)
 class ProductService:
     """Product service"""
     
-    def __init__(self, product_repository: ProductRepository):
+    def __init__(
+        self,
+        product_repository: ProductRepository,
+        catalog_cache: Optional[CatalogCache] = None,
+        notify_channel: Optional[str] = None,
+        quote_ttl: float = 300.0
+    ):
         self.product_repository = product_repository
+        self.catalog_cache = catalog_cache
+        # Postgres NOTIFY channel for evicting the product in other workers
+        self.notify_channel = notify_channel
+        # How long a signed price quote from quote_payment() stays valid
+        self.quote_ttl = quote_ttl
+    
+    async def _invalidate(self, product_id: Optional[int] = None, *skus: Optional[str]) -> None:
+        """Evict product from the catalog cache after a write, here and in other workers"""
+        await self._invalidate_many([product_id] if product_id is not None else [], skus)
+    
+    async def _invalidate_many(self, product_ids: List[int], skus: Iterable[Optional[str]]) -> None:
+        """Evict products after a write; one version bump however many products changed"""
+        skus = list(skus)
+        # New catalog version invalidates price quotes made before the write
+        version = None
+        try:
+            version = await self.product_repository.bump_catalog_version()
+        except Exception as e:
+            logger.warning(f"Failed to bump catalog version: {str(e)}")
+        
+        if self.catalog_cache:
+            for product_id in product_ids:
+                self.catalog_cache.invalidate(product_id=product_id)
+            for sku in skus:
+                if sku:
+                    self.catalog_cache.invalidate(sku=sku)
+            self.catalog_cache.set_version(version)
+        
+        if self.notify_channel:
+            try:
+                for payload in build_invalidation_payloads(product_ids, skus, version):
+                    await self.product_repository.notify(self.notify_channel, payload)
+            except Exception as e:
+                # The write is already committed; other workers fall back to the cache TTL
+                logger.warning(f"Failed to publish catalog invalidation: {str(e)}")
     
     async def create_product(self, product_data: ProductCreate) -> ProductResponse:
         """Create product"""
@@ -23,6 +73,7 @@ class ProductService:
                 raise ValueError(f"Product with SKU {product_data.sku} already exists")
             
             product = await self.product_repository.create(product_data.dict())
+            await self._invalidate(product.id, product.sku)
             logger.info(f"Product created: {product.name} (SKU: {product.sku})")
             return ProductResponse.model_validate(product)
             
@@ -30,18 +81,70 @@ class ProductService:
             logger.error(f"Failed to create product: {str(e)}")
             raise
     
+    async def bulk_upsert_products(self, products_data: List[ProductCreate]) -> List[ProductResponse]:
+        """Create or update products by SKU in one statement"""
+        try:
+            products = await self.product_repository.bulk_upsert([product.dict() for product in products_data])
+            await self._invalidate_many([product.id for product in products], [product.sku for product in products])
+            logger.info(f"Products upserted: {len(products)}")
+            return [ProductResponse.model_validate(product) for product in products]
+            
+        except Exception as e:
+            logger.error(f"Failed to upsert products: {str(e)}")
+            raise
+    
     async def get_product(self, product_id: int) -> Optional[ProductResponse]:
         """Get product by ID"""
+        if self.catalog_cache:
+            cached = self.catalog_cache.get_by_id(product_id)
+            if cached:
+                return cached
+        
         product = await self.product_repository.get_by_id(product_id)
         if not product:
             return None
         
-        return ProductResponse.from_orm(product)
+        return self._snapshot(product)
+    
+    async def get_product_by_sku(self, sku: str) -> Optional[ProductResponse]:
+        """Get product by SKU"""
+        if self.catalog_cache:
+            cached = self.catalog_cache.get_by_sku(sku)
+            if cached:
+                return cached
+        
+        product = await self.product_repository.get_by_sku(sku)
+        if not product:
+            return None
+        
+        return self._snapshot(product)
     
-    async def get_all_products(self) -> List[ProductResponse]:
-        """Get all products"""
-        products = await self.product_repository.get_all_active()
-        return [ProductResponse.model_validate(product) for product in products]
+    def _snapshot(self, product) -> ProductResponse:
+        """Build response snapshot and cache it"""
+        snapshot = ProductResponse.model_validate(product)
+        if self.catalog_cache:
+            self.catalog_cache.put(snapshot)
+        return snapshot
+    
+    async def _load_catalog(self, product_ids: List[int]) -> Dict[int, ProductResponse]:
+        """Resolve products by IDs from cache, fetching all misses with one query"""
+        catalog = self.catalog_cache.get_many_by_ids(product_ids) if self.catalog_cache else {}
+        
+        missing_ids = [product_id for product_id in product_ids if product_id not in catalog]
+        if missing_ids:
+            for product in await self.product_repository.get_many_by_ids(missing_ids):
+                catalog[product.id] = self._snapshot(product)
+        
+        return catalog
+    
+    async def list_products(self, limit: int, after: Optional[str] = None) -> Page[ProductResponse]:
+        """Get a page of products; after is the next_cursor of the previous page"""
+        products = await self.product_repository.get_page(limit, decode_cursor(after))
+        items, next_cursor = split_page(products, limit)
+        return Page[ProductResponse](
+            items=[ProductResponse.model_validate(product) for product in items],
+            next_cursor=next_cursor
+        )
     
     async def update_product(self, product_id: int, product_data: ProductUpdate) -> Optional[ProductResponse]:
         """Update product"""
@@ -51,6 +154,7 @@ class ProductService:
         
         try:
             update_data = product_data.dict(exclude_unset=True)
+            previous_sku = product.sku
             
             # Check SKU uniqueness if changing
             if 'sku' in update_data and update_data['sku'] != product.sku:
@@ -62,8 +166,9 @@ class ProductService:
                 setattr(product, key, value)
             
             updated_product = await self.product_repository.update(product)
+            await self._invalidate(updated_product.id, previous_sku, updated_product.sku)
             logger.info(f"Product updated: {updated_product.name} (ID: {updated_product.id})")
-            return ProductResponse.from_orm(updated_product)
+            return ProductResponse.model_validate(updated_product)
             
         except Exception as e:
             logger.error(f"Failed to update product: {str(e)}")
@@ -74,6 +179,7 @@ class ProductService:
         try:
             result = await self.product_repository.delete(product_id)
             if result:
+                await self._invalidate(product_id)
                 logger.info(f"Product deleted (soft): {product_id}")
             return result
             
@@ -81,34 +187,156 @@ class ProductService:
             logger.error(f"Failed to delete product: {str(e)}")
             raise
     
+    async def bulk_delete_products(self, product_ids: List[int]) -> int:
+        """Delete products by IDs in one statement"""
+        try:
+            deleted = await self.product_repository.bulk_delete(product_ids)
+            if deleted:
+                await self._invalidate_many(product_ids, [])
+                logger.info(f"Products deleted: {deleted}")
+            return deleted
+            
+        except Exception as e:
+            logger.error(f"Failed to delete products: {str(e)}")
+            raise
+    
+    async def _catalog_version(self) -> int:
+        """Current catalog version, from cache when known"""
+        if self.catalog_cache:
+            version = self.catalog_cache.get_version()
+            if version is not None:
+                return version
+        
+        version = await self.product_repository.get_catalog_version()
+        if self.catalog_cache:
+            self.catalog_cache.set_version(version)
+        return version
+    
+    @staticmethod
+    def _merge_quantities(products: List[ProductItemRequest]) -> Dict[int, int]:
+        """Merge duplicate product lines, keeping the order of first occurrence"""
+        quantities: Dict[int, int] = {}
+        for product_request in products:
+            quantities[product_request.product_id] = (
+                quantities.get(product_request.product_id, 0) + product_request.quantity
+            )
+        return quantities
+    
+    async def quote_payment(self, products: List[ProductItemRequest]) -> PaymentCalculationResponse:
+        """Calculate payment and attach a signed quote token reusable by payment creation"""
+        # Version is read before pricing, so a concurrent write can only invalidate the quote
+        version = await self._catalog_version()
+        calculation = await self.calculate_payment(products)
+        issued_at = time.time()
+        
+        token = sign_token({
+            "v": version,
+            "iat": issued_at,
+            "exp": issued_at + self.quote_ttl,
+            "total": calculation.total_sum,
+            "lines": [product.model_dump() for product in calculation.products]
+        })
+        return calculation.model_copy(update={
+            "quote_token": token,
+            "quote_expires_at": datetime.utcfromtimestamp(issued_at + self.quote_ttl)
+        })
+    
+    async def price_from_quote(
+        self,
+        quote_token: str,
+        products: List[ProductItemRequest]
+    ) -> Optional[PaymentCalculationResponse]:
+        """Calculation stored in a quote token, or None if it is invalid, expired or stale"""
+        quote = verify_token(quote_token)
+        if quote is None:
+            logger.warning("Rejected price quote with invalid signature")
+            return None
+        
+        if quote["exp"] < time.time():
+            return None
+        
+        lines = [ProductItemResponse(**line) for line in quote["lines"]]
+        if self._merge_quantities(products) != {line.product_id: line.quantity for line in lines}:
+            return None
+        
+        if quote["v"] != await self._catalog_version():
+            logger.info("Price quote made for an older catalog version, re-pricing")
+            return None
+        
+        return PaymentCalculationResponse(
+            total_sum=quote["total"],
+            products=lines,
+            calculated_at=datetime.utcfromtimestamp(quote["iat"])
+        )
+    
     async def calculate_payment(self, products: List[ProductItemRequest]) -> PaymentCalculationResponse:
         """Calculate payment amount based on products"""
+        quantities = self._merge_quantities(products)
+        
+        # Resolve the whole cart from cache, with at most one query for misses
+        catalog = await self._load_catalog(list(quantities))
+        calculation = self._price_cart(quantities, catalog, datetime.utcnow())
+        
+        logger.info(f"Payment calculated: {calculation.total_sum} for {len(calculation.products)} products")
+        return calculation
+    
+    async def calculate_payment_batch(self, request: BatchCalculationRequest) -> BatchCalculationResponse:
+        """Price many carts with one catalog read for the union of their products"""
+        carts = [self._merge_quantities(cart.products) for cart in request.carts]
+        
+        product_ids = list(dict.fromkeys(product_id for quantities in carts for product_id in quantities))
+        catalog = await self._load_catalog(product_ids)
+        calculated_at = datetime.utcnow()
+        
+        results = []
+        for cart, quantities in zip(request.carts, carts):
+            try:
+                calculation = self._price_cart(quantities, catalog, calculated_at)
+                results.append(CartCalculationResult(
+                    cart_id=cart.cart_id,
+                    total_sum=calculation.total_sum,
+                    products=calculation.products
+                ))
+            except ValueError as e:
+                results.append(CartCalculationResult(cart_id=cart.cart_id, error=str(e)))
+        
+        failed = sum(1 for result in results if result.error)
+        logger.info(f"Batch calculated: {len(results)} carts, {len(product_ids)} products, {failed} failed")
+        return BatchCalculationResponse(results=results, calculated_at=calculated_at)
+    
+    @staticmethod
+    def _price_cart(
+        quantities: Dict[int, int],
+        catalog: Dict[int, ProductResponse],
+        calculated_at: datetime
+    ) -> PaymentCalculationResponse:
+        """Price merged cart lines from resolved products; raises ValueError listing unknown IDs"""
+        missing_ids = [product_id for product_id in quantities if product_id not in catalog]
+        if missing_ids:
+            raise ValueError(f"Products with IDs {missing_ids} not found")
+        
         calculated_products = []
         total_sum = 0.0
         
-        for product_request in products:
-            # Get product from DB
-            product = await self.product_repository.get_by_id(product_request.product_id)
-            if not product:
-                raise ValueError(f"Product with ID {product_request.product_id} not found")
+        for product_id, quantity in quantities.items():
+            product = catalog[product_id]
             
             # Calculate amount
             unit_price = product.price
-            total_price = unit_price * product_request.quantity
+            total_price = unit_price * quantity
             total_sum += total_price
             
             calculated_products.append(ProductItemResponse(
                 product_id=product.id,
                 name=product.name,
                 sku=product.sku,
-                quantity=product_request.quantity,
+                quantity=quantity,
                 unit_price=unit_price,
                 total_price=total_price
             ))
         
-        logger.info(f"Payment calculated: {total_sum} for {len(products)} products")
         return PaymentCalculationResponse(
             total_sum=total_sum,
             products=calculated_products,
-            calculated_at=datetime.utcnow()
-        )
\ No newline at end of file
+            calculated_at=calculated_at
+        )
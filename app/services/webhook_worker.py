@@ -0,0 +1,86 @@
+import json
+import logging
+from typing import Optional, Tuple
+from app.config import settings
+from app.database import async_session
+from app.models.webhook_event import WebhookEvent
+from app.repositories.payment_repository import PaymentRepository
+from app.repositories.webhook_event_repository import WebhookEventRepository
+from app.services.background_worker import LeaseQueueWorker
+from app.services.payment_state_machine import PaymentStateMachine, map_monobank_state
+from app.services.payment_events import publish_status_change
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookEventWorker(LeaseQueueWorker):
+    """Processes stored Monobank callbacks from the webhook_events table
+
+    Each event is applied in its own savepoint, so one bad event doesn't
+    roll back the rest of the batch. Callbacks for payments that are not
+    committed yet are retried with backoff.
+    """
+
+    name = "webhook-events"
+
+    async def _process(
+        self,
+        state_machine: PaymentStateMachine,
+        event: WebhookEvent
+    ) -> Optional[Tuple[str, str]]:
+        """Apply one Monobank callback, return (external ID, status) if the payment changed"""
+        callback_data = json.loads(event.body)
+        order_id = callback_data.get("order_id")
+        status = callback_data.get("status")
+
+        new_status = map_monobank_state(status)
+        if not order_id or new_status is None:
+            logger.warning(f"Skipping webhook event {event.id}: order_id={order_id}, status={status}")
+            return None
+
+        result = await state_machine.apply(order_id, new_status)
+        if result.outcome == "not_found":
+            raise LookupError(f"Payment {order_id} not found")
+        return (order_id, result.status) if result.applied else None
+
+    async def run_once(self) -> int:
+        async with async_session() as session:
+            events = await WebhookEventRepository(session).claim_batch(self.batch_size, self.lease_seconds)
+            if not events:
+                return 0
+
+            repository = WebhookEventRepository(session, autocommit=False)
+            state_machine = PaymentStateMachine(PaymentRepository(session, autocommit=False))
+            changed = []
+            failed = 0
+
+            for event in events:
+                try:
+                    async with session.begin_nested():
+                        change = await self._process(state_machine, event)
+                    repository.mark_done(event)
+                    if change:
+                        changed.append(change)
+                except Exception as e:
+                    failed += 1
+                    repository.mark_failed(event, str(e), self._retry_at(event))
+
+            await session.commit()
+
+        # Only after commit: waiters re-reading the row must see the new status
+        for external_id, status in changed:
+            publish_status_change(external_id, status)
+        if failed:
+            logger.warning(f"Webhook events: {len(events) - failed} processed, {failed} failed")
+        return len(events)
+
+
+webhook_worker = WebhookEventWorker(
+    concurrency=settings.webhook_workers,
+    poll_interval=settings.webhook_poll_interval,
+    batch_size=settings.webhook_batch_size,
+    lease_seconds=settings.webhook_lease_seconds,
+    max_attempts=settings.webhook_max_attempts,
+    backoff_base=settings.webhook_backoff_base,
+    backoff_max=settings.webhook_backoff_max
+)
@@ -1,7 +1,8 @@
 import hashlib
 import hmac
 import base64
-from typing import Dict, Any
+import json
+from typing import Dict, Any, Optional
 from app.config import settings
 
 
@@ -19,3 +20,30 @@ def verify_webhook_signature(body: bytes, signature: str) -> bool:
     
     expected_base64 = base64.b64encode(expected_signature).decode('utf-8')
     return hmac.compare_digest(signature, expected_base64)
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def sign_token(payload: Dict[str, Any]) -> str:
+    """Підписаний токен: base64url(JSON).base64url(HMAC-SHA256 з SECRET_KEY)"""
+    body = _b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+    signature = hmac.new(settings.secret_key.encode("utf-8"), body.encode("ascii"), hashlib.sha256).digest()
+    return f"{body}.{_b64encode(signature)}"
+
+
+def verify_token(token: str) -> Optional[Dict[str, Any]]:
+    """Перевірка підпису токена; None, якщо токен пошкоджений або підроблений"""
+    try:
+        body, signature = token.split(".", 1)
+        expected = hmac.new(settings.secret_key.encode("utf-8"), body.encode("ascii"), hashlib.sha256).digest()
+        if not hmac.compare_digest(_b64decode(signature), expected):
+            return None
+        return json.loads(_b64decode(body))
+    except (ValueError, UnicodeError):
+        return None
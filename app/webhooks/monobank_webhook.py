@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Request, HTTPException, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.dependencies import get_payment_service
 from app.database import get_db
+from app.repositories.webhook_event_repository import WebhookEventRepository
+from app.services.webhook_worker import webhook_worker
 from app.utils.security import verify_webhook_signature
 import json
 import logging
@@ -13,9 +14,14 @@ logger = logging.getLogger(__name__)
 @router.post("/monobank/callback")
 async def monobank_callback(
     request: Request,
-    payment_service = Depends(get_payment_service)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Обробка callback від Monobank"""
+    """Обробка callback від Monobank
+    
+    Після перевірки підпису сире тіло зберігається в таблицю webhook_events
+    і одразу повертається 200. Статус застосовує фоновий webhook_worker,
+    тому час відповіді не залежить від подальшої обробки.
+    """
     try:
         # Отримуємо тіло запиту
         body = await request.body()
@@ -26,19 +32,21 @@ async def monobank_callback(
             logger.warning("Invalid webhook signature")
             raise HTTPException(status_code=401, detail="Invalid signature")
         
-        # Парсимо дані
-        callback_data = json.loads(body.decode())
-        order_id = callback_data.get("order_id")
-        status = callback_data.get("status")
+        # Перевіряємо, що тіло - валідний JSON
+        try:
+            json.loads(body.decode())
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
         
-        logger.info(f"Received Monobank callback: {callback_data}")
+        # Зберігаємо подію; повторна доставка того ж тіла відкидається
+        created = await WebhookEventRepository(db).enqueue("monobank", body)
+        if created:
+            webhook_worker.wake()
         
-        # Отримуємо статус платежу через сервіс
-        payment_status = await payment_service.get_payment_status(order_id)
-        logger.info(f"Payment {order_id} status: {payment_status}")
-        
-        return {"status": "success", "message": "Callback processed"}
+        return {"status": "success", "message": "Callback accepted"}
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Monobank callback processing failed: {str(e)}")
         raise HTTPException(status_code=500, detail="Callback processing failed")
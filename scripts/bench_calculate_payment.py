@@ -0,0 +1,100 @@
+"""
+Benchmark for ProductService.calculate_payment
+
+Compares the legacy per-line lookup (one get_by_id round trip per cart line)
+with the batched pricing path (one get_many_by_ids round trip per cart).
+Database latency is simulated with a fixed round-trip delay so the numbers
+only reflect the number of round trips.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_calculate_payment.py [--rtt-ms 1.0] [--runs 20]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import List, Optional
+
+from app.schemas.payment import ProductItemRequest
+from app.services.product_service import ProductService
+
+
+class SimulatedProductRepository:
+    """In-memory product repository with a fixed delay per round trip"""
+
+    def __init__(self, products_count: int, rtt: float):
+        self.rtt = rtt
+        self.round_trips = 0
+        self.products = {
+            product_id: SimpleNamespace(
+                id=product_id,
+                name=f"Product {product_id}",
+                sku=f"SKU-{product_id}",
+                price=100.0 + product_id,
+                description=None,
+                photo=None,
+                created_at=datetime(2024, 1, 1),
+                updated_at=datetime(2024, 1, 1)
+            )
+            for product_id in range(1, products_count + 1)
+        }
+
+    async def _round_trip(self):
+        self.round_trips += 1
+        await asyncio.sleep(self.rtt)
+
+    async def get_by_id(self, product_id: int) -> Optional[SimpleNamespace]:
+        await self._round_trip()
+        return self.products.get(product_id)
+
+    async def get_many_by_ids(self, product_ids: List[int]) -> List[SimpleNamespace]:
+        await self._round_trip()
+        return [self.products[i] for i in set(product_ids) if i in self.products]
+
+
+async def legacy_calculate_payment(repository: SimulatedProductRepository, products: List[ProductItemRequest]):
+    """Previous implementation: one lookup per cart line"""
+    total_sum = 0.0
+    for product_request in products:
+        product = await repository.get_by_id(product_request.product_id)
+        if not product:
+            raise ValueError(f"Product with ID {product_request.product_id} not found")
+        total_sum += product.price * product_request.quantity
+    return total_sum
+
+
+async def measure(fn, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def main(rtt_ms: float, runs: int):
+    repository = SimulatedProductRepository(products_count=200, rtt=rtt_ms / 1000)
+    service = ProductService(repository)
+
+    print(f"Simulated DB round trip: {rtt_ms:.2f} ms, median of {runs} runs")
+    print(f"{'cart lines':>10} | {'legacy, ms':>11} | {'batched, ms':>11} | {'speedup':>7}")
+
+    for cart_size in (1, 5, 10, 20, 40, 80):
+        cart = [
+            ProductItemRequest(product_id=(i % 200) + 1, quantity=1)
+            for i in range(cart_size)
+        ]
+        legacy = await measure(lambda: legacy_calculate_payment(repository, cart), runs)
+        batched = await measure(lambda: service.calculate_payment(cart), runs)
+        print(f"{cart_size:>10} | {legacy:>11.2f} | {batched:>11.2f} | {legacy / batched:>6.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="simulated DB round trip in milliseconds")
+    parser.add_argument("--runs", type=int, default=20, help="runs per cart size")
+    args = parser.parse_args()
+    asyncio.run(main(args.rtt_ms, args.runs))
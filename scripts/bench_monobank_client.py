@@ -0,0 +1,102 @@
+"""
+Benchmark for MonobankService HTTP transport
+
+Runs a local keep-alive HTTP stub that answers like the Monobank order
+status endpoint and compares a client opened per call (previous behaviour)
+with the app-scoped pooled client. The stub is plain TCP on localhost, so
+the gain shown here is the connection setup only; against Monobank the
+per-call path also pays a TLS handshake, which widens the gap.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_monobank_client.py [--calls 200] [--concurrency 1]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from app.core.http_client import create_http_client
+from app.services.monobank_service import MonobankService
+
+RESPONSE_BODY = json.dumps({"order_id": "bench", "state": "IN_PROCESS"}).encode()
+
+
+async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Minimal HTTP/1.1 keep-alive responder"""
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            content_length = 0
+            for line in head.decode("latin-1").split("\r\n"):
+                if line.lower().startswith("content-length:"):
+                    content_length = int(line.split(":", 1)[1])
+            if content_length:
+                await reader.readexactly(content_length)
+
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: application/json\r\n"
+                + f"Content-Length: {len(RESPONSE_BODY)}\r\n\r\n".encode()
+                + RESPONSE_BODY
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+async def run_calls(service: MonobankService, calls: int, concurrency: int) -> list:
+    semaphore = asyncio.Semaphore(concurrency)
+    timings = []
+
+    async def one_call():
+        async with semaphore:
+            started = time.perf_counter()
+            await service.get_order_status("bench")
+            timings.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(one_call() for _ in range(calls)))
+    return timings
+
+
+def describe(name: str, timings: list) -> str:
+    timings = sorted(timings)
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    return f"{name:<18} mean {statistics.mean(timings):7.3f} ms | p50 {statistics.median(timings):7.3f} ms | p99 {p99:7.3f} ms"
+
+
+async def main(calls: int, concurrency: int):
+    server = await asyncio.start_server(handle_connection, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}"
+
+    async with server:
+        per_call = MonobankService("bench", "secret", base_url=base_url)
+        per_call_timings = await run_calls(per_call, calls, concurrency)
+
+        client = create_http_client(
+            max_connections=100,
+            max_keepalive_connections=20,
+            keepalive_expiry=30.0,
+            connect_timeout=5.0,
+            read_timeout=30.0
+        )
+        pooled = MonobankService("bench", "secret", base_url=base_url, http_client=client)
+        await pooled.get_order_status("bench")  # warm up the pool
+        pooled_timings = await run_calls(pooled, calls, concurrency)
+        await client.aclose()
+
+    print(f"{calls} calls, concurrency {concurrency}")
+    print(describe("client per call", per_call_timings))
+    print(describe("pooled client", pooled_timings))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.concurrency))
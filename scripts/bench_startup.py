@@ -0,0 +1,90 @@
+"""
+Benchmark for the database step of worker cold start
+
+Compares the previous startup (Base.metadata.create_all, which inspects the
+catalog for every table, index and sequence) with the current one (a single
+read of alembic_version compared to the migration head). The pool is
+disposed before every run, so each one pays for a fresh connection like a
+newly started worker. Statements sent to the database are counted too:
+on a networked Postgres each one is a round trip. Run against a migrated
+database (scripts/migrate.py).
+
+Usage:
+    PYTHONPATH=. python scripts/bench_startup.py [--runs 20]
+"""
+
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from sqlalchemy import event
+from app.database import check_schema_version, engine, get_schema_head
+from app.models import Base
+
+
+async def legacy_startup() -> None:
+    """Previous implementation: create_all on every worker start"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def measure(step: Callable[[], Awaitable[None]], runs: int) -> Tuple[List[float], int]:
+    """Timings of cold runs of step and statements executed per run"""
+    statements = 0
+
+    def count(*args) -> None:
+        nonlocal statements
+        statements += 1
+
+    timings = []
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        for _ in range(runs):
+            await engine.dispose()
+            get_schema_head.cache_clear()
+            started = time.perf_counter()
+            await step()
+            timings.append((time.perf_counter() - started) * 1000)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+    return timings, statements // runs
+
+
+def measure_import(runs: int) -> List[float]:
+    """Time to import the app module in a fresh interpreter"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import app.main"], check=True)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def report(name: str, timings: List[float], statements: Optional[int] = None) -> None:
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    line = f"{name:<32} median {statistics.median(timings):8.2f} ms   p95 {p95:8.2f} ms"
+    if statements is not None:
+        line += f"   {statements} statements"
+    print(line)
+
+
+async def main(runs: int) -> None:
+    try:
+        await check_schema_version()
+        report("create_all (before)", *await measure(legacy_startup, runs))
+        report("schema version check (after)", *await measure(check_schema_version, runs))
+    finally:
+        await engine.dispose()
+    report("import app.main", measure_import(min(runs, 5)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.runs))
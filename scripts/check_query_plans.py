@@ -0,0 +1,184 @@
+"""
+EXPLAIN check for the payment lookup paths and paginated lists
+
+Seeds a large dataset into a migrated Postgres database (DATABASE_URL),
+runs ANALYZE and asserts that the repository lookups are planned as index
+scans on the expected indexes instead of sequential scans. Everything runs
+in one transaction that is rolled back, so the database is left unchanged.
+
+Usage:
+    alembic upgrade head
+    PYTHONPATH=. python scripts/check_query_plans.py [--payments 200000] [--items-per-payment 3]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Tuple
+
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from app.config import settings
+from app.models.customer import Customer
+from app.models.payment import Payment
+from app.models.payment_item import PaymentItem
+from app.models.product import Product
+from app.repositories.pagination import keyset_page
+from app.services.payment_reconciler import NON_TERMINAL_STATES
+
+SEED_SQL = [
+    """
+    INSERT INTO customers (phone, created_at, updated_at)
+    SELECT '+999' || lpad(g::text, 9, '0'), now(), now()
+    FROM generate_series(1, :customers) AS g
+    """,
+    """
+    INSERT INTO products (name, price, sku, created_at, updated_at)
+    SELECT 'Product ' || g, 100 + g % 50, 'PLAN-CHECK-' || g, now(), now()
+    FROM generate_series(1, :products) AS g
+    """,
+    # Nearly all payments are final, as in production
+    """
+    INSERT INTO payments (external_id, store_order_id, customer_id, total_sum, status, created_at, updated_at)
+    SELECT
+        'plan-check-' || g,
+        'order-' || g,
+        (SELECT min(id) FROM customers) + g % :customers,
+        100,
+        CASE WHEN g % 100 = 0 THEN 'pending' WHEN g % 10 = 0 THEN 'fail' ELSE 'success' END,
+        now() - (g || ' seconds')::interval,
+        now()
+    FROM generate_series(1, :payments) AS g
+    """,
+    """
+    INSERT INTO payment_items (payment_id, product_id, customer_id, quantity, unit_price, total_price, created_at, updated_at)
+    SELECT
+        p.id,
+        (SELECT min(id) FROM products) + (p.id * :items_per_payment + i) % :products,
+        p.customer_id,
+        1, 100, 100, now(), now()
+    FROM payments p, generate_series(1, :items_per_payment) AS i
+    WHERE p.external_id LIKE 'plan-check-%'
+    """,
+]
+
+
+async def sample_ids(connection: AsyncConnection) -> Dict[str, int]:
+    """IDs from the middle of the seeded data to look up"""
+    row = (await connection.execute(text(
+        """
+        SELECT payment_id, customer_id, product_id FROM payment_items
+        ORDER BY id DESC LIMIT 1 OFFSET 1000
+        """
+    ))).one()
+    return {"payment_id": row.payment_id, "customer_id": row.customer_id, "product_id": row.product_id}
+
+
+def build_checks(ids: Dict[str, int]) -> List[Tuple[str, Any, str]]:
+    """(description, statement as issued by the repository, index it must use)"""
+    created_before = datetime.utcnow() - timedelta(minutes=10)
+    return [
+        (
+            "PaymentItemRepository.get_by_payment_id",
+            select(PaymentItem).where(PaymentItem.payment_id == ids["payment_id"]),
+            "ix_payment_items_payment_id"
+        ),
+        (
+            "PaymentItemRepository.get_by_customer_id",
+            select(PaymentItem).where(PaymentItem.customer_id == ids["customer_id"]),
+            "ix_payment_items_customer_id"
+        ),
+        (
+            "PaymentItemRepository.get_by_product_id",
+            select(PaymentItem).where(PaymentItem.product_id == ids["product_id"]),
+            "ix_payment_items_product_id"
+        ),
+        (
+            "PaymentRepository.get_by_customer_id",
+            select(Payment).where(Payment.customer_id == ids["customer_id"]),
+            "ix_payments_customer_id"
+        ),
+        (
+            "PaymentRepository.get_page_by_status",
+            select(Payment)
+            .where(
+                Payment.status.in_(NON_TERMINAL_STATES),
+                Payment.created_at < created_before,
+                Payment.external_id.is_not(None),
+                tuple_(Payment.created_at, Payment.id) > tuple_(created_before - timedelta(days=1), 0)
+            )
+            .order_by(Payment.created_at, Payment.id)
+            .limit(100),
+            "ix_payments_status_created_at_id"
+        ),
+        *(
+            (
+                f"{model.__name__}Repository.get_page",
+                keyset_page(select(model), model, 50, after=(created_before - timedelta(hours=1), 0)),
+                f"ix_{model.__tablename__}_created_at_id"
+            )
+            for model in (Customer, Product, Payment)
+        ),
+    ]
+
+
+def plan_nodes(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+async def explain(connection: AsyncConnection, statement) -> Dict[str, Any]:
+    sql = statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    result = await connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+async def main(payments: int, items_per_payment: int) -> int:
+    engine = create_async_engine(settings.database_url)
+    failures = 0
+    try:
+        async with engine.connect() as connection:
+            transaction = await connection.begin()
+            try:
+                params = {
+                    "customers": max(1, payments // 20),
+                    "products": 1000,
+                    "payments": payments,
+                    "items_per_payment": items_per_payment
+                }
+                for sql in SEED_SQL:
+                    await connection.execute(text(sql), params)
+                for table in ("customers", "products", "payments", "payment_items"):
+                    await connection.execute(text(f"ANALYZE {table}"))
+
+                ids = await sample_ids(connection)
+                for description, statement, index in build_checks(ids):
+                    nodes = list(plan_nodes(await explain(connection, statement)))
+                    used = sorted({node["Index Name"] for node in nodes if "Index Name" in node})
+                    seq_scans = [node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"]
+                    ok = index in used and not seq_scans
+                    failures += not ok
+                    print(f"{'OK  ' if ok else 'FAIL'} {description}: indexes={used or '-'} seq_scans={seq_scans or '-'}")
+            finally:
+                await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+    print(f"{failures} check(s) failed" if failures else "All lookups use their indexes")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payments", type=int, default=200000)
+    parser.add_argument("--items-per-payment", type=int, default=3)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.payments, args.items_per_payment)))
@@ -1,19 +1,12 @@
-import asyncio
-from sqlalchemy.ext.asyncio import create_async_engine
-from app.config import settings
-from app.models import Base
+from scripts.migrate import migrate
 
 
-async def init_db():
+def init_db():
     """Initialize database"""
-    engine = create_async_engine(settings.database_url)
-    
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    migrate()
     
     print("Database initialized successfully!")
-    await engine.dispose()
 
 
 if __name__ == "__main__":
-    asyncio.run(init_db())
+    init_db()
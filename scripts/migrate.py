@@ -0,0 +1,53 @@
+"""
+Migrate the database to the latest schema revision
+
+Run once per rollout, before the new app workers start; the workers only
+check that the schema is at the latest revision. A database created by the
+old create_all startup (tables but no alembic_version) is stamped with the
+initial revision first, then upgraded.
+
+Usage:
+    PYTHONPATH=. python scripts/migrate.py [revision]
+"""
+
+import argparse
+import asyncio
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.database import ALEMBIC_INI
+
+# Exactly the schema the old create_all startup built; later objects come from upgrade
+INITIAL_REVISION = "0001"
+
+
+async def needs_stamp() -> bool:
+    """True for a pre-migrations database: app tables exist but alembic_version doesn't"""
+    engine = create_async_engine(settings.database_url)
+    try:
+        async with engine.connect() as conn:
+            tables = await conn.run_sync(lambda sync_conn: set(inspect(sync_conn).get_table_names()))
+    finally:
+        await engine.dispose()
+    return "payments" in tables and "alembic_version" not in tables
+
+
+def migrate(revision: str = "head") -> None:
+    """Upgrade the database to revision"""
+    config = Config(str(ALEMBIC_INI))
+    if asyncio.run(needs_stamp()):
+        print(f"Existing schema without migration history, stamping {INITIAL_REVISION}")
+        command.stamp(config, INITIAL_REVISION)
+    command.upgrade(config, revision)
+    print(f"Database migrated to {revision}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("revision", nargs="?", default="head")
+    args = parser.parse_args()
+    migrate(args.revision)